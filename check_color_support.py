@@ -1,31 +1,43 @@
 
-from rich.console import Console
-from rich.text import Text
 import os
 import sys
+from functools import lru_cache
 
-console = Console()
+@lru_cache(maxsize=1)
+def _detect():
+    """Detect terminal color capabilities once per process."""
+    from rich.console import Console
+
+    return (os.environ.get('TERM'), os.environ.get('COLORTERM'), Console().color_system)
+
+def clear_cache():
+    """Reset the cached detection (useful after changing env in tests)."""
+    _detect.cache_clear()
+
+# The colors from theme.py, in display order
+_COLORS = (
+    ("BACKGROUND", "#0f1015"),
+    ("ACCENT", "#06b6d4"),
+    ("SECONDARY", "#a78bfa"),
+    ("TEXT", "#e5e7eb"),
+    ("DIM", "#6b7280"),
+    ("STATUS_DIM", "#4d7c7c"),
+    ("SUCCESS", "#10b981"),
+    ("ERROR", "#ef4444"),
+    ("WARNING", "#f59e0b"),
+)
 
 def check_colors():
-    print(f"Terminal: {os.environ.get('TERM')}")
-    print(f"ColorTerm: {os.environ.get('COLORTERM')}")
-    print(f"Rich Console System: {console.color_system}")
-    
-    # Define the colors from theme.py
-    colors = {
-        "BACKGROUND": "#0f1015",
-        "ACCENT": "#06b6d4",
-        "SECONDARY": "#a78bfa",
-        "TEXT": "#e5e7eb",
-        "DIM": "#6b7280",
-        "STATUS_DIM": "#4d7c7c",
-        "SUCCESS": "#10b981",
-        "ERROR": "#ef4444",
-        "WARNING": "#f59e0b"
-    }
+    from rich.console import Console
+
+    console = Console()
+    term, colorterm, color_system = _detect()
+    print(f"Terminal: {term}")
+    print(f"ColorTerm: {colorterm}")
+    print(f"Rich Console System: {color_system}")
 
     print("\nColor Test:")
-    for name, hex_val in colors.items():
+    for name, hex_val in _COLORS:
         # Print a block of the color and the text
         console.print(f"[{hex_val}]██████[/{hex_val}] {name} ({hex_val})")
 
@@ -6,8 +6,10 @@ This is the main entry point for the Haunted Terminal application.
 """
 
 import sys
-from src.cli import main
 
 
 if __name__ == "__main__":
+    # Imported here so the whole CLI module tree (rich, ollama client, ...)
+    # isn't loaded when this file is merely imported
+    from src.cli import main
     sys.exit(main())
@@ -2,13 +2,34 @@
 Blacklist manager for patterns Ollama should never use.
 """
 
+import os
+import re
+import sys
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Directories/files already ensured this process, so repeat constructions
+# skip the mkdir/exists syscalls.
+_dirs_created: set = set()
+_files_ensured: set = set()
 
 
 class Blacklist:
     """Manages patterns that should never appear in generated commands."""
-    
+
+    # Parsed patterns cached per file, keyed on (st_mtime_ns, st_size) so the
+    # file is only re-read when it actually changes on disk.
+    _cache: Dict[Path, Tuple[int, int, List[str]]] = {}
+
+    # Compiled alternation regex per file, keyed on the same
+    # (st_mtime_ns, st_size) file key as _cache.
+    _compiled_cache: Dict[Path, Tuple[tuple, re.Pattern]] = {}
+
+    # Case-folded frozenset per file for O(1) exact-match lookups,
+    # keyed the same way.
+    _set_cache: Dict[Path, Tuple[tuple, frozenset]] = {}
+
     def __init__(self, blacklist_file: str = None):
         """
         Initialize blacklist.
@@ -19,14 +40,25 @@ class Blacklist:
         if blacklist_file is None:
             home = Path.home()
             haunted_dir = home / ".haunted"
-            haunted_dir.mkdir(exist_ok=True)
+            if haunted_dir not in _dirs_created:
+                haunted_dir.mkdir(exist_ok=True)
+                _dirs_created.add(haunted_dir)
             self.blacklist_file = haunted_dir / "blacklist.txt"
         else:
             self.blacklist_file = Path(blacklist_file)
-        
-        # Create default blacklist if it doesn't exist
-        if not self.blacklist_file.exists():
-            self._create_default_blacklist()
+
+        # The default file is only materialized on first write, so a
+        # first run that never blacklists anything touches no disk; a
+        # single os.stat doubles as the existence check.
+        if self.blacklist_file in _files_ensured:
+            self._materialized = True
+        else:
+            try:
+                os.stat(self.blacklist_file)
+                self._materialized = True
+                _files_ensured.add(self.blacklist_file)
+            except FileNotFoundError:
+                self._materialized = False
     
     def _create_default_blacklist(self):
         """Create a default blacklist file."""
@@ -43,46 +75,165 @@ class Blacklist:
 # Add your blacklisted patterns below:
 """
         self.blacklist_file.write_text(default_content)
+        self._materialized = True
+        _files_ensured.add(self.blacklist_file)
     
     def load_blacklist(self) -> List[str]:
         """
         Load blacklist patterns from file.
-        
+
         Returns:
             List of blacklisted patterns
         """
-        if not self.blacklist_file.exists():
-            return []
-        
-        patterns = []
+        return self._load_with_key()[1]
+
+    def _load_with_key(self) -> Tuple[Optional[tuple], List[str]]:
+        """
+        Load patterns along with the (st_mtime_ns, st_size) file key.
+
+        The key identifies the file version the patterns came from, so
+        the derived caches (frozenset, compiled regex) can validate
+        against it; None means the load wasn't cacheable (missing or
+        unreadable file).
+        """
+        if not self._materialized:
+            return None, []
+
+        try:
+            stat = os.stat(self.blacklist_file)
+        except OSError:
+            return None, []
+
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(self.blacklist_file)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return file_key, cached[2]
+
         try:
-            content = self.blacklist_file.read_text()
-            for line in content.split('\n'):
-                line = line.strip()
-                
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-                
-                patterns.append(line)
+            if stat.st_size > 64 * 1024:
+                patterns = self._parse_mmap()
+            else:
+                # Large buffer so the file is consumed in one read() syscall
+                with open(self.blacklist_file, 'r', encoding='utf-8', buffering=1 << 20) as f:
+                    content = f.read()
+                # lstrip first so comment lines are discarded before the
+                # second allocation an rstrip would cost
+                patterns = []
+                for line in content.splitlines():
+                    s = line.lstrip()
+                    if not s or s[0] == '#':
+                        continue
+                    # Interned: patterns live for the whole session and are
+                    # repeatedly hashed/compared downstream
+                    patterns.append(sys.intern(s.rstrip()))
         except Exception:
-            return []
-        
+            return None, []
+
+        self._cache[self.blacklist_file] = (stat.st_mtime_ns, stat.st_size, patterns)
+        return file_key, patterns
+
+    def _parse_mmap(self) -> List[str]:
+        """Parse a large blacklist file via mmap, decoding only kept lines."""
+        import mmap
+
+        patterns = []
+        with open(self.blacklist_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in mm.read().split(b'\n'):
+                    line = raw.strip()
+                    if not line or line[:1] == b'#':
+                        continue
+                    patterns.append(sys.intern(line.decode('utf-8')))
         return patterns
-    
+
+    def load_set(self) -> frozenset:
+        """
+        Load blacklist patterns as a case-folded frozenset.
+
+        Membership tests are O(1) and callers don't need to re-lower
+        their query string per pattern.
+
+        Returns:
+            Frozenset of lowercased patterns
+        """
+        file_key, patterns = self._load_with_key()
+        if file_key is not None:
+            cached = self._set_cache.get(self.blacklist_file)
+            if cached is not None and cached[0] == file_key:
+                return cached[1]
+
+        pattern_set = frozenset(p.lower() for p in patterns)
+        if file_key is not None:
+            self._set_cache[self.blacklist_file] = (file_key, pattern_set)
+        return pattern_set
+
+    def compiled(self) -> Optional[re.Pattern]:
+        """
+        Get a single case-insensitive regex matching any blacklisted pattern.
+
+        Matching a command against this is O(len(command)) regardless of how
+        many patterns exist, instead of one scan per pattern.
+
+        Returns:
+            Compiled regex, or None if the blacklist is empty
+        """
+        file_key, patterns = self._load_with_key()
+        if not patterns:
+            return None
+
+        if file_key is not None:
+            cached = self._compiled_cache.get(self.blacklist_file)
+            if cached is not None and cached[0] == file_key:
+                return cached[1]
+
+        regex = re.compile('|'.join(re.escape(p) for p in patterns), re.IGNORECASE)
+        if file_key is not None:
+            self._compiled_cache[self.blacklist_file] = (file_key, regex)
+        return regex
+
+    def matches(self, command: str) -> bool:
+        """Check whether a command contains any blacklisted pattern."""
+        regex = self.compiled()
+        return regex is not None and regex.search(command) is not None
+
+    def invalidate(self):
+        """Drop any cached patterns for this blacklist file."""
+        self._cache.pop(self.blacklist_file, None)
+        self._compiled_cache.pop(self.blacklist_file, None)
+        self._set_cache.pop(self.blacklist_file, None)
+
     def add_pattern(self, pattern: str):
         """
         Add a pattern to the blacklist.
-        
+
         Args:
             pattern: Pattern to blacklist
         """
-        if not pattern or not pattern.strip():
+        self.add_patterns([pattern])
+
+    def add_patterns(self, patterns: Iterable[str]):
+        """
+        Add multiple patterns to the blacklist in a single write.
+
+        Args:
+            patterns: Patterns to blacklist; empty/whitespace entries are skipped
+        """
+        cleaned = [p.strip() for p in patterns if p and p.strip()]
+        if not cleaned:
             return
-        
-        # Append to file
-        with open(self.blacklist_file, 'a') as f:
-            f.write(f"{pattern.strip()}\n")
+
+        if not self._materialized:
+            self._create_default_blacklist()
+
+        # O_APPEND makes the single write atomic, so concurrent CLI
+        # instances can't interleave partial lines
+        data = ('\n'.join(cleaned) + '\n').encode('utf-8')
+        fd = os.open(self.blacklist_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        self.invalidate()
     
     def get_blacklist_file_path(self) -> str:
         """Get the path to the blacklist file."""
@@ -3,16 +3,29 @@ CLI interface for Haunted Terminal.
 Handles user interaction, display, and main REPL loop.
 """
 
-import sqlite3
+import atexit
+import concurrent.futures
+import hashlib
+import os
+import re
 import time
+from collections import OrderedDict, deque
 from datetime import datetime
+from itertools import islice
 from typing import List, Optional
 from dataclasses import dataclass
-from src.theme import ThemeManager
+from src.theme import ThemeManager, Text, ACCENT, DIM, SECONDARY, STATUS_DIM, SUCCESS, TEXT
 from src.ollama_client import OllamaClient, OllamaConnectionError, OllamaInterpretationError
 from src.executor import CommandExecutor, ExecutionResult
-from src.safety import classify_command, get_confirmation, CommandRisk
-from src.history import HistoryManager
+from functools import lru_cache
+from src.safety import classify_command as _classify_raw, get_confirmation, CommandRisk
+
+# Risk classification is pure string analysis over a fixed pattern table,
+# so repeated commands (very common interactively) skip the regex sweep
+classify_command = lru_cache(maxsize=512)(_classify_raw)
+# sqlite3 comes from src.history so the except clauses here catch the
+# same driver's errors history raises (stdlib or pysqlite3)
+from src.history import HistoryManager, sqlite3
 from src.context import ContextManager
 from src.rituals import RitualManager
 from src.corrector import PathCorrector
@@ -20,8 +33,70 @@ from src.knowledge import KnowledgeBase
 from src.blacklist import Blacklist
 from src.spirits import SpiritSuggestions
 
+# Single compiled scanner for builtin argument parsing; one findall()
+# replaces the per-handler split/strip round-trips
+_TOK = re.compile(r"\S+")
+
+# Upper bound on retained session commands; only the most recent ten are
+# ever displayed, so an unbounded list just leaks memory in long sessions
+_SESSION_HISTORY_MAX = 200
+
+# Keyword sets tested on every turn; frozensets avoid rebuilding a list
+# literal and scanning it linearly per check
+_EXIT_KEYWORDS = frozenset({"exit", "quit"})
+_RETRY_KEYWORDS = frozenset({"retry", "r", "again"})
+
+# Static display text parsed from markup once at import; printing a
+# prebuilt Text skips Rich's markup lexing on every call
+_OFFLINE_BANNER = Text.from_markup(
+    f"[{SUCCESS}]✓[/{SUCCESS}] offline mode · all processing local"
+)
+_HELP_TEXT = Text.from_markup("\n".join([
+    "",
+    f"[{SECONDARY}]haunted terminal commands[/{SECONDARY}]",
+    "",
+    f"[{STATUS_DIM}]  help, ?          show this help message[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  retry, r         retry last command with different approach[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  history          show recent command history[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  ritual           manage and execute workflows[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  knowledge        edit knowledge base (custom commands)[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  system           show system status[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  explain <cmd>    explain a shell command[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  alias            manage command aliases[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  clear            clear the screen[/{STATUS_DIM}]",
+    f"[{STATUS_DIM}]  exit, quit       exit the application[/{STATUS_DIM}]",
+    "",
+    f"[{STATUS_DIM}]or just type what you want to do in plain english[/{STATUS_DIM}]",
+    "",
+]))
+
+# Markup fragments for the per-turn status lines, assembled once instead
+# of re-rendering the f-string template on every loop iteration
+_DIM_OPEN = f"[{STATUS_DIM}]"
+_DIM_CLOSE = f"[/{STATUS_DIM}]"
+_RETRYING_PREFIX = f"[{SECONDARY}]retrying:[/{SECONDARY}] "
+_RETRY_TIP = Text.from_markup(
+    f"[{STATUS_DIM}]tip: type 'retry' or 'r' to try a different approach[/{STATUS_DIM}]"
+)
+
+# Escapes Rich markup brackets in one C-level pass instead of two
+# chained str.replace scans
+_RICH_ESCAPE = str.maketrans({"[": r"\[", "]": r"\]"})
 
-@dataclass
+def _maybe_pathish(command: str) -> bool:
+    """
+    Whether a command has any argument the path corrector could rewrite.
+
+    Any non-flag argument qualifies — lowercase extensionless names like
+    `cat notes` are fair game for fuzzy matching. Bare commands (`ls`,
+    `pwd`) and flag-only ones still skip the corrector, whose own
+    listing-backed fast path keeps the remaining hits cheap.
+    """
+    parts = command.split()
+    return any(not p.startswith('-') for p in parts[1:])
+
+
+@dataclass(slots=True)
 class SessionCommand:
     """Represents a command executed in the current session."""
     natural_language: str
@@ -59,21 +134,72 @@ class HauntedCLI:
         self.blacklist = Blacklist()
         self.spirits = SpiritSuggestions(self.history)
         
-        self.session_history: List[SessionCommand] = []
+        # LRU cache of past interpretations so repeated inputs with the
+        # same context skip the Ollama round-trip entirely
+        self._interpret_cache: OrderedDict = OrderedDict()
+        self._interpret_cache_size = 128
+        try:
+            size_pref = self.history.get_preference("interpret_cache_size")
+            if size_pref:
+                self._interpret_cache_size = int(size_pref)
+        except Exception:
+            pass
+        self._cache_epoch = 0
+
+        # Small pool so the spirit suggestion lookup (getcwd + SQLite) runs
+        # concurrently with the Ollama round-trip instead of before it
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+        # Prompt context from the previous turn, reused verbatim on retry
+        self._last_prompt_ctx: Optional[tuple] = None
+
+        # Queued history writes survive an unexpected exit
+        atexit.register(self.history.flush)
+
+        self.session_history: deque = deque(maxlen=_SESSION_HISTORY_MAX)
         self.last_natural_input: Optional[str] = None
         self.last_failed_command: Optional[str] = None
         self.retry_current_input: bool = False
         self.running = False
+
+        # Dispatch tables for built-in commands: exact tokens map straight
+        # to their handler, prefixed commands are checked in order
+        self._builtin_exact = {
+            'help': self._cmd_help,
+            '?': self._cmd_help,
+            'commands': self._cmd_help,
+            'history': self._cmd_history,
+            'ritual': self._cmd_ritual_overview,
+            'knowledge': self._cmd_knowledge,
+            'clear': self._cmd_clear,
+            'explain': self._cmd_explain,
+            'alias': self._cmd_alias,
+            'aliases': self._cmd_alias,
+            'unalias': self._cmd_unalias,
+            'system': self._cmd_system,
+        }
+        self._builtin_prefix = (
+            ('suggest', self._cmd_suggest),
+            ('config', self._cmd_config),
+            ('ritual', self._cmd_ritual),
+        )
     
+    def _blank(self, n: int = 1) -> None:
+        """
+        Write n blank separator lines directly to the console's file.
+
+        A bare console.print() walks Rich's full render pipeline and takes
+        its lock just to emit a newline; a direct write is one syscall.
+        """
+        self.theme.console.file.write("\n" * n)
+
     def display_welcome(self) -> None:
         """Display clean welcome header."""
         self.theme.display_welcome()
         
         # Display offline operation confirmation
-        from src.theme import SUCCESS
-        text_obj = self.theme.console.render_str(f"[{SUCCESS}]✓[/{SUCCESS}] offline mode · all processing local")
-        self.theme.console.print(text_obj)
-        self.theme.console.print()
+        self.theme.console.print(_OFFLINE_BANNER)
+        self._blank()
     
     def handle_builtin_command(self, user_input: str) -> bool:
         """
@@ -85,375 +211,385 @@ class HauntedCLI:
         Returns:
             True if command was handled, False if it should go to Ollama
         """
-        cmd = user_input.lower().strip()
-        
-        # Help command
-        if cmd in ['help', '?', 'commands']:
-            self.theme.console.print()
-            from src.theme import SECONDARY, STATUS_DIM
-            self.theme.console.print(f"[{SECONDARY}]haunted terminal commands[/{SECONDARY}]")
-            self.theme.console.print()
-            self.theme.console.print(f"[{STATUS_DIM}]  help, ?          show this help message[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  retry, r         retry last command with different approach[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  history          show recent command history[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  ritual           manage and execute workflows[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  knowledge        edit knowledge base (custom commands)[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  system           show system status[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  explain <cmd>    explain a shell command[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  alias            manage command aliases[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  clear            clear the screen[/{STATUS_DIM}]")
-            self.theme.console.print(f"[{STATUS_DIM}]  exit, quit       exit the application[/{STATUS_DIM}]")
-            self.theme.console.print()
-            self.theme.console.print(f"[{STATUS_DIM}]or just type what you want to do in plain english[/{STATUS_DIM}]")
-            self.theme.console.print()
-            return True
-        
-        # History command
-        if cmd == 'history':
-            from src.theme import SECONDARY, STATUS_DIM, SUCCESS, DIM
-            self.theme.console.print()
-            
-            # Show session history
-            if self.session_history:
-                self.theme.console.print(f"[{SECONDARY}]current session[/{SECONDARY}]")
-                self.theme.console.print()
-                for cmd_obj in self.session_history[-10:]:
-                    status = f"[{SUCCESS}]✓[/{SUCCESS}]" if cmd_obj.result and cmd_obj.result.exit_code == 0 else "✗"
-                    self.theme.console.print(f"  {status} [{STATUS_DIM}]{cmd_obj.natural_language}[/{STATUS_DIM}]")
-                    self.theme.console.print(f"     → {cmd_obj.shell_command}")
-                self.theme.console.print()
-            
-            # Show recent persistent history
-            recent = []
-            try:
-                recent = self.history.get_recent_commands(limit=10)
-                if recent:
-                    self.theme.console.print(f"[{SECONDARY}]recent history (all sessions)[/{SECONDARY}]")
-                    self.theme.console.print()
-                    for entry in recent:
-                        status = f"[{SUCCESS}]✓[/{SUCCESS}]" if entry.exit_code == 0 else "✗"
-                        self.theme.console.print(f"  {status} [{STATUS_DIM}]{entry.natural_language}[/{STATUS_DIM}]")
-                        self.theme.console.print(f"     → {entry.shell_command}")
-                        timestamp_str = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                        self.theme.console.print(f"     [{DIM}]{timestamp_str}[/{DIM}]")
-                    self.theme.console.print()
-            except Exception as e:
-                self.theme.display_warning(f"could not load persistent history: {str(e)}")
-            
-            if not self.session_history and not recent:
-                self.theme.display_warning("no command history available")
-            
-            self.theme.console.print()
-            return True
-        
-        # Ritual command
-        if cmd == 'ritual':
-            from src.theme import SECONDARY, STATUS_DIM, SUCCESS
-            self.theme.console.print()
-            
-            rituals = self.rituals.list_rituals()
-            if rituals:
-                self.theme.console.print(f"[{SECONDARY}]available rituals[/{SECONDARY}]")
-                self.theme.console.print()
-                for ritual in rituals:
-                    self.theme.console.print(f"  🔮 [{SUCCESS}]{ritual.name}[/{SUCCESS}]")
-                    if ritual.description:
-                        self.theme.console.print(f"     [{STATUS_DIM}]{ritual.description}[/{STATUS_DIM}]")
-                self.theme.console.print()
-                self.theme.console.print(f"[{STATUS_DIM}]run with: perform <ritual_name>[/{STATUS_DIM}]")
-            else:
-                self.theme.console.print(f"[{STATUS_DIM}]no rituals defined yet[/{STATUS_DIM}]")
-                self.theme.console.print()
-                self.theme.console.print(f"[{STATUS_DIM}]create rituals in ~/.haunted/rituals/[/{STATUS_DIM}]")
+        # Strip, lower, and tokenize exactly once; handlers receive the
+        # stripped input plus the token list so they never re-split
+        stripped = user_input.strip()
+        cmd = stripped.lower()
+        toks = _TOK.findall(stripped)
+
+        handler = self._builtin_exact.get(cmd)
+        if handler is not None:
+            return handler(stripped, toks)
+
+        for prefix, prefix_handler in self._builtin_prefix:
+            if cmd.startswith(prefix):
+                return prefix_handler(stripped, toks)
+
+        return False
+
+    def _cmd_help(self, user_input: str, toks: List[str]) -> bool:
+        """Show the built-in help listing."""
+        # Prebuilt Text: no markup parse, one tty write
+        self.theme.console.print(_HELP_TEXT)
+        return True
+
+    def _cmd_history(self, user_input: str, toks: List[str]) -> bool:
+        """Show session and persistent command history."""
+        # Accumulate all entries and emit one buffered print per section
+        lines = [""]
+
+        # Show session history
+        if self.session_history:
+            lines.append(f"[{SECONDARY}]current session[/{SECONDARY}]")
+            lines.append("")
+            start = max(0, len(self.session_history) - 10)
+            for cmd_obj in islice(self.session_history, start, None):
+                status = f"[{SUCCESS}]✓[/{SUCCESS}]" if cmd_obj.result and cmd_obj.result.exit_code == 0 else "✗"
+                lines.append(f"  {status} [{STATUS_DIM}]{cmd_obj.natural_language}[/{STATUS_DIM}]")
+                lines.append(f"     → {cmd_obj.shell_command}")
+            lines.append("")
+
+        # Show recent persistent history
+        recent = []
+        try:
+            recent = self.history.get_recent_commands(limit=10)
+            if recent:
+                lines.append(f"[{SECONDARY}]recent history (all sessions)[/{SECONDARY}]")
+                lines.append("")
+                for entry in recent:
+                    status = f"[{SUCCESS}]✓[/{SUCCESS}]" if entry.exit_code == 0 else "✗"
+                    lines.append(f"  {status} [{STATUS_DIM}]{entry.natural_language}[/{STATUS_DIM}]")
+                    lines.append(f"     → {entry.shell_command}")
+                    timestamp_str = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                    lines.append(f"     [{DIM}]{timestamp_str}[/{DIM}]")
+                lines.append("")
+        except Exception as e:
+            self.theme.console.print("\n".join(lines))
+            lines = []
+            self.theme.display_warning(f"could not load persistent history: {str(e)}")
+
+        if not self.session_history and not recent:
+            if lines:
+                self.theme.console.print("\n".join(lines))
+            self.theme.display_warning("no command history available")
+            self._blank()
+        elif lines:
+            # Trailing spacer folded into the single buffered write
+            lines.append("")
+            self.theme.console.print("\n".join(lines))
+        return True
+
+    def _cmd_ritual_overview(self, user_input: str, toks: List[str]) -> bool:
+        """Show available rituals."""
+        lines = [""]
+
+        rituals = self.rituals.list_rituals()
+        if rituals:
+            lines.append(f"[{SECONDARY}]available rituals[/{SECONDARY}]")
+            lines.append("")
+            for ritual in rituals:
+                lines.append(f"  🔮 [{SUCCESS}]{ritual.name}[/{SUCCESS}]")
+                if ritual.description:
+                    lines.append(f"     [{STATUS_DIM}]{ritual.description}[/{STATUS_DIM}]")
+            lines.append("")
+            lines.append(f"[{STATUS_DIM}]run with: perform <ritual_name>[/{STATUS_DIM}]")
+        else:
+            lines.append(f"[{STATUS_DIM}]no rituals defined yet[/{STATUS_DIM}]")
+            lines.append("")
+            lines.append(f"[{STATUS_DIM}]create rituals in ~/.haunted/rituals/[/{STATUS_DIM}]")
+
+        lines.append("")
+        self.theme.console.print("\n".join(lines))
+        return True
+
+    def _cmd_knowledge(self, user_input: str, toks: List[str]) -> bool:
+        """Show the knowledge base summary."""
+        knowledge_path = self.knowledge.get_knowledge_file_path()
+        lines = [
+            "",
+            f"[{SECONDARY}]knowledge base[/{SECONDARY}]",
+            "",
+            f"[{STATUS_DIM}]location: {knowledge_path}[/{STATUS_DIM}]",
+            "",
+        ]
+
+        # Show current entries
+        entries = self.knowledge.load_knowledge()
+        if entries:
+            lines.append(f"[{STATUS_DIM}]current entries:[/{STATUS_DIM}]")
+            for natural, command in entries[:10]:
+                lines.append(f"  • {natural}")
+                lines.append(f"    → {command}")
+            if len(entries) > 10:
+                lines.append(f"[{STATUS_DIM}]  ... and {len(entries) - 10} more[/{STATUS_DIM}]")
+        else:
+            lines.append(f"[{STATUS_DIM}]no entries yet[/{STATUS_DIM}]")
+
+        lines.append("")
+        lines.append(f"[{STATUS_DIM}]edit with: open {knowledge_path}[/{STATUS_DIM}]")
+        lines.append("")
+        self.theme.console.print("\n".join(lines))
+        return True
+
+    def _cmd_clear(self, user_input: str, toks: List[str]) -> bool:
+        """Clear the screen and redraw the welcome banner."""
+        self.theme.console.clear()
+        self.display_welcome()
+        return True
             
-            self.theme.console.print()
+
+    def _cmd_explain(self, user_input: str, toks: List[str]) -> bool:
+        """Explain a shell command via Ollama."""
+        if len(toks) < 2:
+            self.theme.display_warning("usage: explain <shell command>")
             return True
-        
-        # Knowledge command
-        if cmd == 'knowledge':
-            from src.theme import SECONDARY, STATUS_DIM
-            self.theme.console.print()
-            knowledge_path = self.knowledge.get_knowledge_file_path()
-            self.theme.console.print(f"[{SECONDARY}]knowledge base[/{SECONDARY}]")
-            self.theme.console.print()
-            self.theme.console.print(f"[{STATUS_DIM}]location: {knowledge_path}[/{STATUS_DIM}]")
-            self.theme.console.print()
-            
-            # Show current entries
-            entries = self.knowledge.load_knowledge()
-            if entries:
-                self.theme.console.print(f"[{STATUS_DIM}]current entries:[/{STATUS_DIM}]")
-                for natural, command in entries[:10]:
-                    self.theme.console.print(f"  • {natural}")
-                    self.theme.console.print(f"    → {command}")
-                if len(entries) > 10:
-                    self.theme.console.print(f"[{STATUS_DIM}]  ... and {len(entries) - 10} more[/{STATUS_DIM}]")
-            else:
-                self.theme.console.print(f"[{STATUS_DIM}]no entries yet[/{STATUS_DIM}]")
+
+        # Avoid the join allocation for the common single-word case
+        target_cmd = toks[1] if len(toks) == 2 else ' '.join(toks[1:])
+        with self.theme.loading_animation("consulting spirits"):
+            explanation = self.ollama.explain_command(target_cmd)
             
-            self.theme.console.print()
-            self.theme.console.print(f"[{STATUS_DIM}]edit with: open {knowledge_path}[/{STATUS_DIM}]")
-            self.theme.console.print()
-            return True
-        
-        # Clear command
-        if cmd == 'clear':
-            self.theme.console.clear()
-            self.display_welcome()
+        self._blank()
+        self.theme.console.print(f"[{ACCENT}]Explanation:[/{ACCENT}] {explanation}")
+        self._blank()
+        return True
+
+    def _cmd_alias(self, user_input: str, toks: List[str]) -> bool:
+        """List or create command aliases."""
+        # List aliases
+        if len(toks) == 1:
+            aliases = self.history.list_aliases()
+            self._blank()
+            self.theme.console.print(f"[{SECONDARY}]active aliases[/{SECONDARY}]")
+            if not aliases:
+                self.theme.console.print("  [dim]no aliases defined[/dim]")
+            for name, command in aliases:
+                self.theme.console.print(f"  [{SUCCESS}]{name}[/{SUCCESS}] = [{ACCENT}]{command}[/{ACCENT}]")
+            self._blank()
             return True
             
-        # Explain command
-        if cmd == 'explain':
-            cmd_parts = user_input.strip().split(' ', 1)
-            if len(cmd_parts) < 2:
-                self.theme.display_warning("usage: explain <shell command>")
-                return True
-            
-            target_cmd = cmd_parts[1]
-            with self.theme.loading_animation("consulting spirits"):
-                explanation = self.ollama.explain_command(target_cmd)
-            
-            self.theme.console.print()
-            from src.theme import ACCENT
-            self.theme.console.print(f"[{ACCENT}]Explanation:[/{ACCENT}] {explanation}")
-            self.theme.console.print()
+        # Add alias: alias name = command — split at the '=' token when it
+        # stands alone, falling back to the glued 'name=command' form
+        if '=' in toks[1:]:
+            eq = toks.index('=', 1)
+            name = ' '.join(toks[1:eq])
+            command = ' '.join(toks[eq + 1:])
+        elif '=' in user_input:
+            name, command = [x.strip() for x in user_input.split(' ', 1)[1].split('=', 1)]
+        else:
+            self.theme.display_warning("usage: alias name = command")
             return True
 
-        # Alias commands
-        if cmd == 'alias' or cmd == 'aliases':
-            cmd_parts = user_input.strip().split(' ', 1)
+        self.history.add_alias(name, command)
+        self._cache_epoch += 1
+        self.theme.display_success(f"alias '{name}' created")
+        return True
             
-            # List aliases
-            if len(cmd_parts) == 1:
-                aliases = self.history.list_aliases()
-                self.theme.console.print()
-                from src.theme import SECONDARY, SUCCESS, ACCENT
-                self.theme.console.print(f"[{SECONDARY}]active aliases[/{SECONDARY}]")
-                if not aliases:
-                    self.theme.console.print("  [dim]no aliases defined[/dim]")
-                for name, command in aliases:
-                    self.theme.console.print(f"  [{SUCCESS}]{name}[/{SUCCESS}] = [{ACCENT}]{command}[/{ACCENT}]")
-                self.theme.console.print()
-                return True
-            
-            # Add alias: alias name = command
-            args = cmd_parts[1]
-            if '=' in args:
-                name, command = [x.strip() for x in args.split('=', 1)]
-                self.history.add_alias(name, command)
-                self.theme.display_success(f"alias '{name}' created")
-            else:
-                self.theme.display_warning("usage: alias name = command")
-            return True
-            
-        if cmd == 'unalias':
-            cmd_parts = user_input.strip().split(' ', 1)
-            if len(cmd_parts) < 2:
-                self.theme.display_warning("usage: unalias <name>")
-                return True
-                
-            if self.history.remove_alias(cmd_parts[1]):
-                self.theme.display_success(f"alias '{cmd_parts[1]}' removed")
-            else:
-                self.theme.display_warning(f"alias '{cmd_parts[1]}' not found")
+
+    def _cmd_unalias(self, user_input: str, toks: List[str]) -> bool:
+        """Remove a command alias."""
+        if len(toks) < 2:
+            self.theme.display_warning("usage: unalias <name>")
             return True
+
+        if self.history.remove_alias(toks[1]):
+            self._cache_epoch += 1
+            self.theme.display_success(f"alias '{toks[1]}' removed")
+        else:
+            self.theme.display_warning(f"alias '{toks[1]}' not found")
+        return True
         
-        # System info command
-        if cmd == 'system':
-            import platform
-            import shutil
-            import os
-            
-            self.theme.console.print()
-            from src.theme import ACCENT, STATUS_DIM, TEXT
-            
-            try:
-                user = os.getlogin()
-            except:
-                user = os.environ.get('USER', 'unknown')
-
-            info = {
-                "OS": f"{platform.system()} {platform.release()}",
-                "Machine": platform.machine(),
-                "Python": platform.python_version(),
-                "User": user,
-                "CWD": self.executor.get_working_directory(),
-            }
-            
-            # Check disk usage for CWD
-            try:
-                total, used, free = shutil.disk_usage(info["CWD"])
-                info["Disk Free"] = f"{free // (2**30)} GB"
-            except:
-                pass
-
-            self.theme.console.print(f"[{ACCENT}]System Status[/{ACCENT}]")
-            for k, v in info.items():
-                self.theme.console.print(f"  [{STATUS_DIM}]{k}:[/{STATUS_DIM}] [{TEXT}]{v}[/{TEXT}]")
-            self.theme.console.print()
+
+    def _cmd_system(self, user_input: str, toks: List[str]) -> bool:
+        """Show system status information."""
+        try:
+            user = os.getlogin()
+        except:
+            user = os.environ.get('USER', 'unknown')
+
+        # Cold path: only loaded when the user actually asks for `system`
+        import platform
+        import shutil
+
+        info = {
+            "OS": f"{platform.system()} {platform.release()}",
+            "Machine": platform.machine(),
+            "Python": platform.python_version(),
+            "User": user,
+            "CWD": self.executor.get_working_directory(),
+        }
+
+        # Check disk usage for CWD
+        try:
+            total, used, free = shutil.disk_usage(info["CWD"])
+            info["Disk Free"] = f"{free // (2**30)} GB"
+        except:
+            pass
+
+        lines = ["", f"[{ACCENT}]System Status[/{ACCENT}]"]
+        for k, v in info.items():
+            lines.append(f"  [{STATUS_DIM}]{k}:[/{STATUS_DIM}] [{TEXT}]{v}[/{TEXT}]")
+        lines.append("")
+        self.theme.console.print("\n".join(lines))
+        return True
+
+    def _cmd_suggest(self, user_input: str, toks: List[str]) -> bool:
+        """Show command suggestions from history."""
+        if len(toks) == 1:
+            # No args, suggest for current directory
+            cwd = self.executor.get_working_directory()
+            suggestions = self.history.get_directory_suggestions(cwd, limit=5)
+            title = f"Suggestions for {cwd}"
+        else:
+            # Query provided
+            query = toks[1] if len(toks) == 2 else ' '.join(toks[1:])
+            suggestions = self.history.get_suggestions(query, limit=5)
+            title = f"Suggestions matching '{query}'"
+
+        if not suggestions:
+            self._blank()
+            self.theme.display_warning("no suggestions found")
+            self._blank()
+        else:
+            lines = ["", f"[{ACCENT}]{title}:[/{ACCENT}]"]
+            for s in suggestions:
+                lines.append(f"  [{STATUS_DIM}]{s.natural_language}[/{STATUS_DIM}] → {s.shell_command}")
+            lines.append("")
+            self.theme.console.print("\n".join(lines))
+        return True
+
+    def _cmd_config(self, user_input: str, toks: List[str]) -> bool:
+        """Get or set user preferences."""
+        if len(toks) < 3:
+            self.theme.display_warning("usage: config <set|get> <key> [value]")
             return True
 
-        # Suggest command
-        if cmd.startswith('suggest'):
-            parts = user_input.strip().split(' ', 1)
-            if len(parts) == 1:
-                # No args, suggest for current directory
-                cwd = self.executor.get_working_directory()
-                suggestions = self.history.get_directory_suggestions(cwd, limit=5)
-                title = f"Suggestions for {cwd}"
-            else:
-                # Query provided
-                query = parts[1]
-                suggestions = self.history.get_suggestions(query, limit=5)
-                title = f"Suggestions matching '{query}'"
-
-            self.theme.console.print()
-            if not suggestions:
-                self.theme.display_warning("no suggestions found")
+        action = toks[1]
+        key = toks[2]
+
+        if action == 'set':
+            if len(toks) < 4:
+                self.theme.display_warning("value required")
+                return True
+            value = " ".join(toks[3:])
+            self.history.set_preference(key, value)
+            self.theme.display_success(f"preference '{key}' saved")
+        elif action == 'get':
+            val = self.history.get_preference(key)
+            if val:
+                self.theme.display_success(f"{key} = {val}")
             else:
-                from src.theme import ACCENT, STATUS_DIM
-                self.theme.console.print(f"[{ACCENT}]{title}:[/{ACCENT}]")
-                for s in suggestions:
-                    self.theme.console.print(f"  [{STATUS_DIM}]{s.natural_language}[/{STATUS_DIM}] → {s.shell_command}")
-            self.theme.console.print()
+                self.theme.display_warning(f"preference '{key}' not set")
+        return True
+
+    def _cmd_ritual(self, user_input: str, toks: List[str]) -> bool:
+        """Handle ritual subcommands (list/show/run/create/delete)."""
+        if len(toks) < 2:
+            self.theme.display_warning("usage: ritual <list|show|run|create|delete> [name]")
             return True
 
-        # Config command
-        if cmd.startswith('config'):
-            parts = user_input.strip().split(' ')
-            if len(parts) < 3:
-                self.theme.display_warning("usage: config <set|get> <key> [value]")
-                return True
+        action = toks[1]
             
-            action = parts[1]
-            key = parts[2]
-            
-            if action == 'set':
-                if len(parts) < 4:
-                    self.theme.display_warning("value required")
-                    return True
-                value = " ".join(parts[3:])
-                self.history.set_preference(key, value)
-                self.theme.display_success(f"preference '{key}' saved")
-            elif action == 'get':
-                val = self.history.get_preference(key)
-                if val:
-                    self.theme.display_success(f"{key} = {val}")
-                else:
-                    self.theme.display_warning(f"preference '{key}' not set")
+        if action == 'list':
+            rituals = self.rituals.list_rituals()
+            lines = ["", f"[{ACCENT}]Saved Rituals:[/{ACCENT}]"]
+            if not rituals:
+                lines.append("  [dim]no rituals found[/dim]")
+            for r in rituals:
+                lines.append(f"  [{STATUS_DIM}]{r.name}[/{STATUS_DIM}] - {r.description or 'no description'}")
+            lines.append("")
+            self.theme.console.print("\n".join(lines))
             return True
-
-        # Ritual command
-        if cmd.startswith('ritual'):
-            parts = user_input.strip().split(' ', 2)
-            if len(parts) < 2:
-                self.theme.display_warning("usage: ritual <list|show|run|create|delete> [name]")
-                return True
                 
-            action = parts[1]
+        if len(toks) < 3:
+            self.theme.display_warning(f"name required for ritual {action}")
+            return True
+
+        name = toks[2] if len(toks) == 3 else ' '.join(toks[2:])
             
-            if action == 'list':
-                rituals = self.rituals.list_rituals()
-                self.theme.console.print()
-                from src.theme import ACCENT, STATUS_DIM
-                self.theme.console.print(f"[{ACCENT}]Saved Rituals:[/{ACCENT}]")
-                if not rituals:
-                    self.theme.console.print("  [dim]no rituals found[/dim]")
-                for r in rituals:
-                    self.theme.console.print(f"  [{STATUS_DIM}]{r.name}[/{STATUS_DIM}] - {r.description or 'no description'}")
-                self.theme.console.print()
-                return True
+        if action == 'show':
+            r = self.rituals.get_ritual(name)
+            if r:
+                lines = [
+                    "",
+                    f"[{ACCENT}]Ritual: {r.name}[/{ACCENT}]",
+                    f"[dim]{r.description}[/dim]",
+                ]
+                for step in r.steps:
+                    lines.append(f"  {step.order + 1}. {step.command}")
+                lines.append("")
+                self.theme.console.print("\n".join(lines))
+            else:
+                self.theme.display_warning(f"ritual '{name}' not found")
+            return True
                 
-            if len(parts) < 3:
-                self.theme.display_warning(f"name required for ritual {action}")
-                return True
+        if action == 'delete':
+            if self.rituals.delete_ritual(name):
+                self.theme.display_success(f"ritual '{name}' deleted")
+            else:
+                self.theme.display_warning(f"ritual '{name}' not found")
+            return True
                 
-            name = parts[2]
-            
-            if action == 'show':
-                r = self.rituals.get_ritual(name)
-                if r:
-                    self.theme.console.print()
-                    from src.theme import ACCENT
-                    self.theme.console.print(f"[{ACCENT}]Ritual: {r.name}[/{ACCENT}]")
-                    self.theme.console.print(f"[dim]{r.description}[/dim]")
-                    for step in r.steps:
-                        self.theme.console.print(f"  {step.order + 1}. {step.command}")
-                    self.theme.console.print()
-                else:
-                    self.theme.display_warning(f"ritual '{name}' not found")
+        if action == 'run':
+            r = self.rituals.get_ritual(name)
+            if not r:
+                self.theme.display_warning(f"ritual '{name}' not found")
                 return True
                 
-            if action == 'delete':
-                if self.rituals.delete_ritual(name):
-                    self.theme.display_success(f"ritual '{name}' deleted")
-                else:
-                    self.theme.display_warning(f"ritual '{name}' not found")
-                return True
+            self._blank()
+            self.theme.display_success(f"starting ritual: {name}")
                 
-            if action == 'run':
-                r = self.rituals.get_ritual(name)
-                if not r:
-                    self.theme.display_warning(f"ritual '{name}' not found")
-                    return True
+            for step in r.steps:
+                self.theme.console.print(f"Step {step.order + 1}: {step.command}")
+                # Execute without confirmation for now, or maybe ask once?
+                # For safety, let's re-use existing execution flow or direct executor
+                # Direct executor is safer for automation, but less interactive
+                try:
+                    res = self.executor.execute(step.command)
+                    self.display_output(res)
+                    if res.exit_code != 0:
+                        if self.theme.prompt_confirmation("step failed. continue?") != 'y':
+                            break
+                except Exception as e:
+                    self.theme.display_error(f"failed to execute step: {e}")
+                    break
+            return True
                 
-                self.theme.console.print()
-                self.theme.display_success(f"starting ritual: {name}")
+        if action == 'create':
+            self._blank()
+            self.theme.display_success(f"Creating ritual '{name}'")
+            self._blank()
                 
-                for step in r.steps:
-                    self.theme.console.print(f"Step {step.order + 1}: {step.command}")
-                    # Execute without confirmation for now, or maybe ask once?
-                    # For safety, let's re-use existing execution flow or direct executor
-                    # Direct executor is safer for automation, but less interactive
-                    try:
-                        res = self.executor.execute(step.command)
-                        self.display_output(res)
-                        if res.exit_code != 0:
-                            if self.theme.prompt_confirmation("step failed. continue?") != 'y':
-                                break
-                    except Exception as e:
-                        self.theme.display_error(f"failed to execute step: {e}")
-                        break
-                return True
+            # Get description
+            self.theme.console.print(f"[{STATUS_DIM}]Description (optional):[/{STATUS_DIM}] ", end="")
+            desc = input().strip()
                 
-            if action == 'create':
-                self.theme.console.print()
-                self.theme.display_success(f"Creating ritual '{name}'")
-                self.theme.console.print()
-                
-                # Get description
-                from src.theme import STATUS_DIM
-                self.theme.console.print(f"[{STATUS_DIM}]Description (optional):[/{STATUS_DIM}] ", end="")
-                desc = input().strip()
-                
-                # Get commands
-                self.theme.console.print(f"[{STATUS_DIM}]Enter commands one by one. Type 'done' to finish.[/{STATUS_DIM}]")
-                self.theme.console.print()
-                
-                steps = []
-                while True:
-                    self.theme.console.print(f"[{STATUS_DIM}]step {len(steps) + 1} >[/{STATUS_DIM}] ", end="")
-                    cmd = input().strip()
-                    if cmd.lower() == 'done':
-                        break
-                    if cmd:
-                        steps.append(cmd)
-                        self.theme.console.print(f"  [{STATUS_DIM}]✓ added[/{STATUS_DIM}]")
+            # Get commands
+            self.theme.console.print(f"[{STATUS_DIM}]Enter commands one by one. Type 'done' to finish.[/{STATUS_DIM}]")
+            self._blank()
                 
-                self.theme.console.print()
+            steps = []
+            while True:
+                self.theme.console.print(f"[{STATUS_DIM}]step {len(steps) + 1} >[/{STATUS_DIM}] ", end="")
+                cmd = input().strip()
+                if cmd.lower() == 'done':
+                    break
+                if cmd:
+                    steps.append(cmd)
+                    self.theme.console.print(f"  [{STATUS_DIM}]✓ added[/{STATUS_DIM}]")
                 
-                if steps:
-                    self.rituals.create_ritual(name, desc, steps)
-                    self.theme.display_success(f"ritual '{name}' saved with {len(steps)} steps")
-                else:
-                    self.theme.display_warning("ritual cancelled (no steps)")
+            self._blank()
                 
-                self.theme.console.print()
-                return True
+            if steps:
+                self.rituals.create_ritual(name, desc, steps)
+                self.theme.display_success(f"ritual '{name}' saved with {len(steps)} steps")
+            else:
+                self.theme.display_warning("ritual cancelled (no steps)")
                 
+            self._blank()
             return True
-
-        return False
+                
+        return True
     
     def get_user_input(self) -> Optional[str]:
         """
@@ -466,7 +602,7 @@ class HauntedCLI:
             user_input = self.theme.get_input()
             
             # Handle exit commands
-            if user_input.lower() in ['exit', 'quit']:
+            if user_input.lower() in _EXIT_KEYWORDS:
                 return None
             
             # Validate input length (Requirements 1.2, 1.3)
@@ -512,6 +648,37 @@ class HauntedCLI:
             execution_time=result.execution_time
         )
     
+    def _interpret_cache_key(self, user_input: str, cwd: str,
+                             history: List, rejections: List,
+                             blacklist: List) -> str:
+        """
+        Build a bounded cache key for an interpretation request.
+
+        The epoch counter is mixed in so alias/knowledge mutations
+        invalidate all prior entries at once. The blacklist is part of
+        the key because it reloads on file change mid-session; a cached
+        command must not outlive the blacklist that allowed it.
+        """
+        raw = repr((self._cache_epoch, user_input, cwd,
+                    tuple(history), tuple(rejections), tuple(blacklist)))
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _display_spirit_suggestion(self, suggestion_fut) -> None:
+        """Display a background spirit suggestion if it finished in time."""
+        if suggestion_fut is None:
+            return
+        try:
+            suggestion = suggestion_fut.result(timeout=0.25)
+        except Exception:
+            return
+        if suggestion:
+            suggestion_text, reason = suggestion
+            self._blank()
+            self.theme.console.print(
+                f"[{STATUS_DIM}]the spirits whisper: [{SECONDARY}]\"{suggestion_text}\"[/{SECONDARY}] ({reason})[/{STATUS_DIM}]"
+            )
+            self._blank()
+
     def run(self) -> int:
         """
         Start the main REPL loop.
@@ -519,6 +686,10 @@ class HauntedCLI:
         Returns:
             Exit code (0 for success)
         """
+        # Hot-loop local: one load instead of three attribute lookups per call
+        console_print = self.theme.console.print
+        blank = self._blank
+
         # Display welcome banner
         self.display_welcome()
         
@@ -534,7 +705,7 @@ class HauntedCLI:
                 "  2. Run 'ollama serve'\n"
                 "  3. Pull model: 'ollama pull llama3.2'"
             )
-            self.theme.console.print()
+            blank()
             self.theme.display_warning("command interpretation unavailable")
         except Exception as e:
             # Requirement 7.1, 7.4: Catch unexpected errors during startup
@@ -542,14 +713,18 @@ class HauntedCLI:
                 "unexpected error during connection check",
                 str(e)
             )
-            self.theme.console.print()
+            blank()
         
-        self.theme.console.print()
+        blank()
         self.running = True
         
         # Main REPL loop
         while self.running:
             try:
+                # True when this turn re-interprets the previous input, so
+                # the assembled prompt context can be reused as-is
+                reuse_ctx = False
+
                 # Get user input (with validation error handling)
                 # Unless we're retrying the current input
                 if not self.retry_current_input:
@@ -565,7 +740,7 @@ class HauntedCLI:
                             "Error reading input",
                             f"Details: {str(e)}"
                         )
-                        self.theme.console.print()
+                        blank()
                         continue
                     
                     # Handle exit
@@ -580,33 +755,32 @@ class HauntedCLI:
                     # We're retrying - use the last natural input
                     user_input = self.last_natural_input
                     self.retry_current_input = False  # Reset flag
+                    reuse_ctx = True
                 
                 # Check for alias expansion
                 alias_expansion = self.history.get_alias(user_input)
                 if alias_expansion:
-                    from src.theme import STATUS_DIM
-                    self.theme.console.print(f"[{STATUS_DIM}]expanded alias: {user_input} → {alias_expansion}[/{STATUS_DIM}]")
+                    console_print(f"[{STATUS_DIM}]expanded alias: {user_input} → {alias_expansion}[/{STATUS_DIM}]")
                     user_input = alias_expansion
                 
                 # Check if this is a retry command
-                is_retry = user_input.lower().strip() in ['retry', 'r', 'again']
+                is_retry = user_input.lower().strip() in _RETRY_KEYWORDS
                 
-                # Show spirit suggestion if available
+                # One working-directory read per turn; it can only change
+                # when a command executes, which ends the turn
+                cwd = self.executor.get_working_directory()
+
+                # Kick off the spirit suggestion lookup in the background so
+                # it overlaps with the model call instead of preceding it
+                suggestion_fut = None
                 if not is_retry and len(user_input) >= 3:
-                    suggestion = self.spirits.get_suggestion(
+                    suggestion_fut = self._pool.submit(
+                        self.spirits.get_suggestion,
                         user_input,
-                        self.executor.get_working_directory(),
+                        cwd,
                         datetime.now()
                     )
-                    if suggestion:
-                        from src.theme import STATUS_DIM, SECONDARY
-                        suggestion_text, reason = suggestion
-                        self.theme.console.print()
-                        self.theme.console.print(
-                            f"[{STATUS_DIM}]the spirits whisper: [{SECONDARY}]\"{suggestion_text}\"[/{SECONDARY}] ({reason})[/{STATUS_DIM}]"
-                        )
-                        self.theme.console.print()
-                
+
                 # Check if this is a ritual execution command
                 if user_input.lower().startswith('perform '):
                     ritual_name = user_input[8:].strip()
@@ -621,70 +795,101 @@ class HauntedCLI:
                 if is_retry:
                     if not self.last_natural_input:
                         self.theme.display_warning("no previous command to retry")
-                        self.theme.console.print()
+                        blank()
                         continue
                     
-                    from src.theme import SECONDARY, STATUS_DIM
-                    self.theme.console.print()
-                    self.theme.console.print(f"[{SECONDARY}]retrying:[/{SECONDARY}] [{STATUS_DIM}]{self.last_natural_input}[/{STATUS_DIM}]")
-                    self.theme.console.print()
+                    blank()
+                    console_print(f"{_RETRYING_PREFIX}{_DIM_OPEN}{self.last_natural_input}{_DIM_CLOSE}")
+                    blank()
                     user_input = self.last_natural_input
                 else:
                     # Store this as the last natural input for potential retry
                     self.last_natural_input = user_input
                 
-                # Get context
-                context_str = self.context_mgr.get_context_string()
+                # On retry the input is unchanged from last turn, so reuse
+                # the assembled prompt context instead of re-running the
+                # context/history/knowledge/blacklist gathering
+                if (is_retry or reuse_ctx) and self._last_prompt_ctx is not None:
+                    context_str, combined_history, blacklist_patterns, rejections = self._last_prompt_ctx
+                else:
+                    # Get context for the executor-tracked directory (the
+                    # process cwd never changes now that cd is virtual)
+                    context_str = self.context_mgr.get_context_string(cwd)
 
-                # Get learned history and rejections
-                learned_history = [
-                    (h.natural_language, h.shell_command) 
-                    for h in self.history.get_suggestions(user_input, limit=3)
-                ]
-                rejections = self.history.get_rejections(user_input, limit=3)
-                
-                # Get knowledge base entries
-                knowledge_entries = self.knowledge.search_knowledge(user_input, limit=3)
-                
-                # Combine learned history with knowledge base (knowledge base takes priority)
-                combined_history = knowledge_entries + learned_history
-                
-                # Get blacklist patterns
-                blacklist_patterns = self.blacklist.load_blacklist()
-                
-                # If retrying, add the last failed command to rejections
-                if is_retry and self.last_failed_command:
+                    # Get learned history and rejections in one batched read
+                    turn = self.history.prefetch_turn(user_input, limit=3)
+                    learned_history = [
+                        (h.natural_language, h.shell_command)
+                        for h in turn.suggestions
+                    ]
+                    rejections = turn.rejections
+
+                    # Get knowledge base entries
+                    knowledge_entries = self.knowledge.search_knowledge(user_input, limit=3)
+
+                    # Combine learned history with knowledge base (knowledge base takes priority)
+                    combined_history = knowledge_entries + learned_history
+
+                    # Get blacklist patterns
+                    blacklist_patterns = self.blacklist.load_blacklist()
+
+                    self._last_prompt_ctx = (
+                        context_str, combined_history, blacklist_patterns, rejections
+                    )
+
+                # If retrying, add the last failed command to rejections so
+                # the reused context differs only in the rejection list (and
+                # the interpret cache cannot serve the rejected command back)
+                if (is_retry or reuse_ctx) and self.last_failed_command:
                     rejections = [self.last_failed_command] + rejections
 
                 # Interpret command with Ollama
                 try:
-                    try:
-                        with self.theme.loading_animation("thinking"):
-                            shell_command = self.ollama.interpret_command(
-                                user_input, 
-                                context=context_str,
-                                history=combined_history,
-                                rejections=rejections,
-                                blacklist=blacklist_patterns
-                            )
-                    except KeyboardInterrupt:
-                        # User pressed Ctrl+C during processing
-                        self.theme.console.print()
-                        self.theme.display_warning("cancelled · press ctrl+c again or type 'exit' to quit")
-                        self.theme.console.print()
-                        continue
-                    
-                    # Auto-correct paths
-                    cwd = self.executor.get_working_directory()
+                    cache_key = self._interpret_cache_key(
+                        user_input, cwd, combined_history, rejections,
+                        blacklist_patterns
+                    )
+                    cached_command = self._interpret_cache.get(cache_key)
+                    if cached_command is not None:
+                        self._interpret_cache.move_to_end(cache_key)
+                        shell_command = cached_command
+                    else:
+                        try:
+                            with self.theme.loading_animation("thinking") as anim:
+                                shell_command = self.ollama.interpret_command(
+                                    user_input,
+                                    context=context_str,
+                                    history=combined_history,
+                                    rejections=rejections,
+                                    blacklist=blacklist_patterns,
+                                    on_token=anim.show_partial
+                                )
+                        except KeyboardInterrupt:
+                            # User pressed Ctrl+C during processing
+                            blank()
+                            self.theme.display_warning("cancelled · press ctrl+c again or type 'exit' to quit")
+                            blank()
+                            continue
+                        self._interpret_cache[cache_key] = shell_command
+                        if len(self._interpret_cache) > self._interpret_cache_size:
+                            self._interpret_cache.popitem(last=False)
+
+                    # Show the spirit suggestion now that the model has
+                    # answered; a short timeout keeps slow SQLite from
+                    # ever delaying the preview
+                    self._display_spirit_suggestion(suggestion_fut)
+
+                    # Auto-correct paths (only when there is an argument
+                    # the corrector could act on)
                     original_cmd = shell_command
-                    shell_command = self.corrector.correct_paths(shell_command, cwd)
+                    if _maybe_pathish(shell_command):
+                        shell_command = self.corrector.correct_paths(shell_command, cwd)
                     
                     if shell_command != original_cmd:
-                        from src.theme import STATUS_DIM
-                        self.theme.console.print()
-                        self.theme.console.print(f"[{STATUS_DIM}]path corrected: {original_cmd} → {shell_command}[/{STATUS_DIM}]")
+                        blank()
+                        console_print(f"{_DIM_OPEN}path corrected: {original_cmd} → {shell_command}{_DIM_CLOSE}")
                     
-                    self.theme.console.print()
+                    blank()
                     
                 except OllamaConnectionError as e:
                     # Requirement 7.2: Specific troubleshooting for connection failures
@@ -692,7 +897,7 @@ class HauntedCLI:
                         "cannot reach ollama",
                         "check if ollama is running: 'ollama serve'"
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 except OllamaInterpretationError as e:
@@ -701,7 +906,7 @@ class HauntedCLI:
                         "could not interpret command",
                         "try rephrasing or being more specific"
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 except Exception as e:
@@ -710,7 +915,7 @@ class HauntedCLI:
                         "unexpected interpretation error",
                         str(e)
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 # Validate command syntax
@@ -721,7 +926,7 @@ class HauntedCLI:
                             "invalid command syntax",
                             f"command: {shell_command}"
                         )
-                        self.theme.console.print()
+                        blank()
                         continue
                 except Exception as e:
                     # Requirement 7.1, 7.4: Handle validation errors
@@ -729,7 +934,7 @@ class HauntedCLI:
                         "validation error",
                         str(e)
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 # Display command preview
@@ -746,15 +951,14 @@ class HauntedCLI:
                         f"Details: {str(e)}\n"
                         "  • Command will not be executed for safety"
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 # Handle retry from confirmation
                 if confirmation == "retry":
-                    self.theme.console.print()
-                    from src.theme import SECONDARY, STATUS_DIM
-                    self.theme.console.print(f"[{SECONDARY}]retrying:[/{SECONDARY}] [{STATUS_DIM}]{user_input}[/{STATUS_DIM}]")
-                    self.theme.console.print()
+                    blank()
+                    console_print(f"{_RETRYING_PREFIX}{_DIM_OPEN}{user_input}{_DIM_CLOSE}")
+                    blank()
                     
                     # Add this command to rejections and retry
                     self.last_failed_command = shell_command
@@ -777,11 +981,11 @@ class HauntedCLI:
                         )
                         self.session_history.append(session_cmd)
                     
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 # Execute command
-                self.theme.console.print()
+                blank()
                 
                 try:
                     result = self.executor.execute(shell_command)
@@ -791,7 +995,7 @@ class HauntedCLI:
                         "Command execution failed validation",
                         f"Details: {str(e)}"
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 except Exception as e:
                     # Requirement 7.1, 7.3, 7.4: Unexpected execution errors
@@ -801,7 +1005,7 @@ class HauntedCLI:
                         "  • The command could not be executed\n"
                         "  • Check if the command is valid for your system"
                     )
-                    self.theme.console.print()
+                    blank()
                     continue
                 
                 # Display output (Requirement 7.3: Display stderr with helpful context)
@@ -820,14 +1024,11 @@ class HauntedCLI:
                     # Clear last failed command on success
                     self.last_failed_command = None
                     
-                    # Clear any rejections for this input since we found a working command
-                    try:
-                        self.history.clear_rejections(user_input)
-                    except Exception:
-                        pass  # Fail silently
-                    
+                    # Queue the save (and stale-rejection cleanup); the
+                    # commit happens off the post-execution path at the
+                    # next read or at shutdown
                     try:
-                        self.history.save_command(
+                        self.history.queue_success(
                             natural_language=user_input,
                             shell_command=shell_command,
                             exit_code=result.exit_code,
@@ -841,14 +1042,14 @@ class HauntedCLI:
                             "  • History features may be unavailable\n"
                             "  • The application will continue normally"
                         )
-                        self.theme.console.print()
+                        blank()
                     except Exception as e:
                         # Requirement 7.4: Other history save errors
                         self.theme.display_warning(
                             f"Unexpected error saving to history: {str(e)}\n"
                             "  • History features may be unavailable"
                         )
-                        self.theme.console.print()
+                        blank()
                 else:
                     # Track failed command for retry
                     self.last_failed_command = shell_command
@@ -856,40 +1057,52 @@ class HauntedCLI:
                     # Only add to rejections if command actually failed (not just cancelled)
                     # This helps Ollama learn from actual failures, not user preferences
                     try:
-                        self.history.add_rejection(user_input, shell_command)
+                        self.history.queue_rejection(user_input, shell_command)
+                        # Mirror the new rejection into the cached prompt
+                        # context so successive retries see it without a
+                        # fresh DB read
+                        if self._last_prompt_ctx is not None:
+                            ctx, hist, bl, rej = self._last_prompt_ctx
+                            self._last_prompt_ctx = (ctx, hist, bl, [shell_command] + rej)
                     except Exception:
                         pass  # Fail silently on logging
                     
                     # Show retry hint
-                    from src.theme import STATUS_DIM
-                    self.theme.console.print(f"[{STATUS_DIM}]tip: type 'retry' or 'r' to try a different approach[/{STATUS_DIM}]")
-                    self.theme.console.print()
+                    console_print(_RETRY_TIP)
+                    blank()
                 
             except KeyboardInterrupt:
                 # Requirement 7.5: Handle Ctrl+C gracefully
-                self.theme.console.print()
+                blank()
                 self.theme.display_warning("interrupted · press ctrl+c again or type 'exit' to quit")
-                self.theme.console.print()
+                blank()
                 continue
             
             except Exception as e:
                 # Requirement 7.1, 7.4, 7.5: Catch all other exceptions
-                import traceback
-                error_details = traceback.format_exc()
-                
                 self.theme.display_error(
                     "An unexpected error occurred in the main loop",
                     f"Details: {str(e)}\n"
                     "  • The application will continue running\n"
                     "  • If this persists, please report the issue"
                 )
-                
-                # Log full traceback for debugging (could be written to file in production)
-                self.theme.console.print()
-                # Escape brackets in error details to prevent Rich markup errors
-                safe_error_details = error_details.replace("[", "\\[").replace("]", "\\]")
-                self.theme.console.print(f"[dim]Stack trace: {safe_error_details}[/dim]")
-                self.theme.console.print()
+
+                blank()
+                if os.environ.get("HAUNTED_DEBUG"):
+                    # Full traceback only on request; formatting it allocates
+                    # multi-KB strings the user usually just scrolls past
+                    import traceback
+                    error_details = traceback.format_exc()
+                    # Escape brackets in error details to prevent Rich markup errors
+                    safe_error_details = error_details.translate(_RICH_ESCAPE)
+                    console_print(f"[dim]Stack trace: {safe_error_details}[/dim]")
+                else:
+                    safe_error = str(e).translate(_RICH_ESCAPE)
+                    console_print(
+                        f"[dim]{type(e).__name__}: {safe_error} "
+                        "(set HAUNTED_DEBUG=1 for a full stack trace)[/dim]"
+                    )
+                blank()
                 
                 # Requirement 7.5: Continue running - don't crash
                 continue
@@ -898,13 +1111,14 @@ class HauntedCLI:
     
     def _execute_ritual(self, ritual_name: str) -> None:
         """Execute a ritual workflow with visual feedback."""
+        # Cold path: step-status enum only needed while a ritual runs
         from src.rituals import StepStatus
-        
+
         # Load the ritual
         ritual = self.rituals.get_ritual(ritual_name)
         if not ritual:
             self.theme.display_error(f"ritual not found: {ritual_name}")
-            self.theme.console.print()
+            self._blank()
             return
         
         # Display start banner
@@ -925,20 +1139,20 @@ class HauntedCLI:
         total_time = time.time() - start_time
         
         # Display results for each step
-        self.theme.console.print()
+        self._blank()
         for i, step in enumerate(ritual.steps):
             status_str = "success" if step.status == StepStatus.SUCCESS else "failed"
             self.theme.display_ritual_step(i + 1, len(ritual.steps), step.command, status_str)
             
             if step.output and step.output.strip():
                 # Escape brackets in output to prevent Rich markup errors
-                safe_output = step.output.strip().replace("[", "\\[").replace("]", "\\]")
+                safe_output = step.output.strip().translate(_RICH_ESCAPE)
                 self.theme.console.print(f"  [dim]{safe_output}[/dim]")
-                self.theme.console.print()
+                self._blank()
             
             if step.status == StepStatus.FAILED and step.error:
                 self.theme.display_error(f"step {i + 1} failed", step.error)
-                self.theme.console.print()
+                self._blank()
                 break
         
         # Display completion banner
@@ -946,9 +1160,14 @@ class HauntedCLI:
     
     def _display_farewell(self) -> None:
         """Display clean farewell message."""
-        self.theme.console.print()
+        # Persist any writes still queued from the final turns
+        try:
+            self.history.flush()
+        except Exception:
+            pass  # Fail silently on shutdown
+
+        self._blank()
         
-        from src.theme import Text, STATUS_DIM
         farewell = Text()
         farewell.append("goodbye", style=STATUS_DIM)
         self.theme.console.print(farewell)
@@ -960,7 +1179,7 @@ class HauntedCLI:
             summary.append(f"{executed_count} commands executed this session", style=STATUS_DIM)
             self.theme.console.print(summary)
         
-        self.theme.console.print()
+        self._blank()
     
     def get_session_history(self) -> List[SessionCommand]:
         """
@@ -969,7 +1188,7 @@ class HauntedCLI:
         Returns:
             List of SessionCommand objects
         """
-        return self.session_history.copy()
+        return list(self.session_history)
 
 
 def main() -> int:
@@ -3,10 +3,14 @@ Context manager for detecting project types and environment details.
 """
 
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+# Bound on each per-directory result cache; LRU eviction past this
+_CACHE_MAX = 32
+
 @dataclass
 class ProjectContext:
     type: str
@@ -45,58 +49,161 @@ class ContextManager:
                 "risks": "Container state, port conflicts"
             }
         }
+        # Flat marker-file index: one dict probe per directory entry
+        # instead of a nested indicators × markers scan. The rank map
+        # keeps found-file ordering identical to the indicator table.
+        self._marker_to_key = {
+            m: key for key, info in self.indicators.items() for m in info["files"]
+        }
+        self._marker_rank = {
+            m: i for i, m in enumerate(self._marker_to_key)
+        }
+        # Frozen key set so matching is one C-level intersection against
+        # the (tiny) marker vocabulary rather than a per-name Python loop
+        self._marker_keys = frozenset(self._marker_to_key)
+        # Results memoized per (directory, mtime); creating, renaming, or
+        # deleting entries bumps the directory mtime, so unchanged
+        # directories answer without touching the filesystem
+        self._ctx_cache: OrderedDict = OrderedDict()
+        self._files_cache: OrderedDict = OrderedDict()
+        self._string_cache: OrderedDict = OrderedDict()
 
-    def get_context(self, directory: str = ".") -> List[ProjectContext]:
+    @staticmethod
+    def _dir_mtime(directory: str) -> Optional[int]:
+        """Directory mtime in nanoseconds, or None if it can't be statted."""
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key, value) -> None:
+        """Insert with LRU eviction past the size bound."""
+        cache[key] = value
+        if len(cache) > _CACHE_MAX:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _scan(directory: str) -> Optional[tuple]:
         """
-        Analyze the directory and return a list of detected contexts.
+        Scan a directory once, deriving everything the callers need.
+
+        Returns:
+            (name set, sorted visible names) or None if the scan fails.
         """
-        detected = []
         try:
             # List files in current directory (shallow)
-            # Using os.listdir is faster/safer than walking for this purpose
+            # Using os.scandir is faster/safer than walking for this purpose
             with os.scandir(directory) as entries:
-                files = {entry.name for entry in entries}
+                names = [entry.name for entry in entries]
         except OSError:
-            return []
+            return None
+        # Filter out hidden files/dirs for cleaner context, unless relevant
+        return set(names), sorted(n for n in names if not n.startswith('.'))
 
+    def _detect(self, files: set) -> List[ProjectContext]:
+        """Match the indicator table against a set of directory entries."""
+        found: Dict[str, List[str]] = {}
+        for name in self._marker_keys.intersection(files):
+            found.setdefault(self._marker_to_key[name], []).append(name)
+
+        detected = []
         for key, info in self.indicators.items():
-            found_files = [f for f in info["files"] if f in files]
+            found_files = found.get(key)
             if found_files:
+                found_files.sort(key=self._marker_rank.__getitem__)
                 detected.append(ProjectContext(
                     type=key,
                     description=info["desc"],
                     risk_level="medium", # Default to medium for now
                     files=found_files
                 ))
-        
+        return detected
+
+    @staticmethod
+    def _format_file_list(visible_files: List[str], limit: int) -> str:
+        """Render the visible-file list, truncated past the limit."""
+        if len(visible_files) > limit:
+            return ", ".join(visible_files[:limit]) + f", ... ({len(visible_files)-limit} more)"
+        return ", ".join(visible_files)
+
+    def get_context(self, directory: str = ".") -> List[ProjectContext]:
+        """
+        Analyze the directory and return a list of detected contexts.
+        """
+        mtime = self._dir_mtime(directory)
+        cache_key = (directory, mtime)
+        if mtime is not None:
+            cached = self._ctx_cache.get(cache_key)
+            if cached is not None:
+                self._ctx_cache.move_to_end(cache_key)
+                return cached
+
+        scan = self._scan(directory)
+        if scan is None:
+            return []
+        detected = self._detect(scan[0])
+
+        if mtime is not None:
+            self._cache_put(self._ctx_cache, cache_key, detected)
         return detected
 
     def get_file_list(self, directory: str = ".", limit: int = 50) -> str:
         """Return a comma-separated list of files in the directory."""
-        try:
-            files = sorted(os.listdir(directory))
-            # Filter out hidden files/dirs for cleaner context, unless relevant
-            visible_files = [f for f in files if not f.startswith('.')]
-            
-            if len(visible_files) > limit:
-                return ", ".join(visible_files[:limit]) + f", ... ({len(visible_files)-limit} more)"
-            return ", ".join(visible_files)
-        except Exception:
+        mtime = self._dir_mtime(directory)
+        cache_key = (directory, mtime, limit)
+        if mtime is not None:
+            cached = self._files_cache.get(cache_key)
+            if cached is not None:
+                self._files_cache.move_to_end(cache_key)
+                return cached
+
+        scan = self._scan(directory)
+        if scan is None:
             return "Unable to list files"
+        result = self._format_file_list(scan[1], limit)
+
+        if mtime is not None:
+            self._cache_put(self._files_cache, cache_key, result)
+        return result
+
+    def get_context_string(self, directory: Optional[str] = None) -> str:
+        """
+        Return a formatted string describing the given directory's context.
+
+        The executor tracks `cd` in Python state without chdir-ing the
+        process, so callers must pass its working directory; the process
+        cwd is only a fallback.
+        """
+        cwd = directory if directory is not None else os.getcwd()
+
+        mtime = self._dir_mtime(cwd)
+        cache_key = (cwd, mtime)
+        if mtime is not None:
+            cached = self._string_cache.get(cache_key)
+            if cached is not None:
+                self._string_cache.move_to_end(cache_key)
+                return cached
+
+        # One scan feeds both the indicator match and the file list
+        scan = self._scan(cwd)
+        if scan is None:
+            contexts = []
+            files_str = "Unable to list files"
+        else:
+            contexts = self._detect(scan[0])
+            files_str = self._format_file_list(scan[1], 50)
 
-    def get_context_string(self) -> str:
-        """Return a formatted string describing the current context."""
-        cwd = os.getcwd()
-        contexts = self.get_context(cwd)
-        files_str = self.get_file_list(cwd)
-        
         parts = []
         if contexts:
             desc = ", ".join([c.description for c in contexts])
             parts.append(f"Project: {desc}")
         else:
             parts.append("Project: Generic Directory")
-            
+
         parts.append(f"Files: {files_str}")
-        
-        return "\n".join(parts)
+
+        result = "\n".join(parts)
+        if mtime is not None:
+            self._cache_put(self._string_cache, cache_key, result)
+        return result
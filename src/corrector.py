@@ -2,119 +2,226 @@
 Path correction utility for fuzzy matching file paths in commands.
 """
 
+import functools
 import os
+import re
 import shlex
 import difflib
 from typing import List, Optional
 
+try:
+    # C-extension fuzzy matcher; far faster than difflib on big listings
+    from rapidfuzz import fuzz, process as _rf_process
+except ImportError:
+    _rf_process = None
+
+# Shell constructs we refuse to rewrite, matched in one C-level scan.
+# Also bails on `;` and backticks, which the old per-substring checks missed.
+_BAIL_RE = re.compile(r'[|>;`]|&&')
+
+# Characters that force quoting when a corrected name is spliced back into
+# the command; mirrors the safe set shlex.quote leaves bare
+_UNSAFE_CHAR = re.compile(r"[^\w@%+=:,./~-]").search
+
+
+@functools.lru_cache(maxsize=256)
+def _split(command: str) -> tuple:
+    """
+    shlex.split memoized per command string.
+
+    Returns a tuple so the cached value can be shared between callers
+    without aliasing a mutable list.
+    """
+    return tuple(shlex.split(command))
+
+
 class PathCorrector:
     """
     Corrects file paths in shell commands using fuzzy matching against the current directory.
     """
-    
+
     def __init__(self, cutoff: float = 0.6):
         """
         Initialize the corrector.
-        
+
         Args:
             cutoff: Similarity threshold for fuzzy matching (0.0 to 1.0).
         """
         self.cutoff = cutoff
+        # Directory listings keyed on path, invalidated via mtime; renames,
+        # creates, and deletes all bump the directory mtime
+        self._listing_cache: dict = {}
+        # Resolved tokens keyed on (token, directory, mtime) so repeated
+        # commands against an unchanged directory skip the stat/fuzzy work
+        self._resolve_cache: dict = {}
+        self._resolve_cache_size = 4096
 
     def correct_paths(self, command: str, working_directory: str) -> str:
         """
-        Analyze a shell command and attempt to correct non-existent paths 
+        Analyze a shell command and attempt to correct non-existent paths
         by fuzzy matching against files in the working directory.
-        
+
         Args:
             command: The shell command to correct.
             working_directory: The directory to search for files.
-            
+
         Returns:
             The corrected command (or original if no corrections found).
         """
         try:
             # basic safety check for complex commands
-            if '|' in command or '>' in command or '&&' in command:
+            if _BAIL_RE.search(command):
                 # Parsing complex pipelines is risky; skip correction
                 return command
-                
-            parts = shlex.split(command)
+
+            parts = _split(command)
         except ValueError:
             # shlex failed (e.g. unbalanced quotes), return original
             return command
-            
+
         if not parts:
             return command
-            
-        # Get list of actual files
+
+        # Get list of actual files, reusing the cached listing while the
+        # directory is unchanged
         try:
-            actual_files = os.listdir(working_directory)
+            dir_mtime = os.stat(working_directory).st_mtime_ns
         except OSError:
             return command
-            
-        corrected_parts = []
-        modified = False
-        
+
+        cached = self._listing_cache.get(working_directory)
+        if cached is not None and cached[0] == dir_mtime:
+            actual_files, lower_map, files_set = cached[1], cached[2], cached[3]
+        else:
+            try:
+                actual_files = os.listdir(working_directory)
+            except OSError:
+                return command
+            # Lowercase index built once per listing; setdefault keeps the
+            # first of any case-colliding names, matching the old scan order
+            lower_map = {}
+            for name in actual_files:
+                lower_map.setdefault(name.lower(), name)
+            # Frozen set makes the per-token membership probe O(1) instead
+            # of a linear scan of the listing
+            files_set = frozenset(actual_files)
+            self._listing_cache[working_directory] = (
+                dir_mtime, actual_files, lower_map, files_set
+            )
+
+        # Fast path: every argument is a flag, an exact-case name from the
+        # listing, or a multi-component path that resolves — nothing to
+        # correct, skip the fuzzy machinery. Membership in files_set (not
+        # a bare existence probe) matters on case-insensitive filesystems,
+        # where lexists('readme.md') is true for README.md but the casing
+        # fix-up below must still run.
+        if all(
+            p.startswith('-')
+            or p in files_set
+            or (('/' in p or os.sep in p)
+                and os.path.lexists(os.path.join(working_directory, p)))
+            for p in parts[1:]
+        ):
+            return command
+
         # Skip the first part (the command itself) usually
-        # But for simplicity we iterate all, though correcting the command name itself 
-        # (like 'pyhton' -> 'python') is a different scope. 
+        # But for simplicity we iterate all, though correcting the command name itself
+        # (like 'pyhton' -> 'python') is a different scope.
         # Let's focus on arguments (indices 1+).
-        
-        corrected_parts.append(parts[0])
-        
+
+        substitutions = []
+
         for part in parts[1:]:
             # If it's a flag, skip
             if part.startswith('-'):
-                corrected_parts.append(part)
                 continue
-                
-            # Check if path exists as-is
-            full_path = os.path.join(working_directory, part)
-            if os.path.exists(full_path):
-                # It exists, but on case-insensitive filesystems (macOS/Windows),
-                # the casing might still be "wrong" compared to the actual file.
-                if part in actual_files:
-                    corrected_parts.append(part)
-                elif os.sep not in part and '/' not in part:
-                    # Exists but not exact match in root, and no separators -> likely case mismatch
-                    case_match = self._find_case_insensitive(part, actual_files)
-                    if case_match:
-                        corrected_parts.append(case_match)
-                        modified = True
-                    else:
-                        corrected_parts.append(part)
-                else:
-                    # Path with separators, or not found in listdir (hidden?), keep as is
-                    corrected_parts.append(part)
-                continue
-                
-            # Not found, try fuzzy match
-            matches = difflib.get_close_matches(part, actual_files, n=1, cutoff=self.cutoff)
-            
-            if matches:
-                # We found a close match!
-                # But wait, is it a better match than just a case-insensitive check?
-                # Prioritize case-insensitive exact match
-                case_match = self._find_case_insensitive(part, actual_files)
-                if case_match:
-                    corrected_parts.append(case_match)
-                else:
-                    corrected_parts.append(matches[0])
-                modified = True
-            else:
-                # Try case-insensitive as a fallback even if fuzzy failed high cutoff
-                case_match = self._find_case_insensitive(part, actual_files)
+
+            key = (part, working_directory, dir_mtime)
+            resolved = self._resolve_cache.get(key)
+            if resolved is None:
+                resolved = self._resolve(part, working_directory, actual_files, lower_map, files_set)
+                if len(self._resolve_cache) >= self._resolve_cache_size:
+                    self._resolve_cache.clear()
+                self._resolve_cache[key] = resolved
+
+            if resolved != part:
+                substitutions.append((part, resolved))
+
+        if not substitutions:
+            return command
+
+        # Splice each correction back into the original string instead of
+        # re-quoting every argument through shlex.join; untouched tokens
+        # keep exactly the formatting the user (or model) produced. The
+        # substitution is anchored at token boundaries (whitespace or
+        # quotes) so a token that is a prefix of another argument — e.g.
+        # `foo` alongside `foo.txt` — never rewrites the wrong one. When
+        # the matched occurrence already sits inside quotes, the raw name
+        # is spliced between them; re-quoting there would nest quotes and
+        # split the argument. The scan starts after the command name,
+        # which substitutions (collected from parts[1:] only) must never
+        # touch even when an argument spells the same word.
+        head_end = re.match(r"\s*\S+", command).end()
+        head, out = command[:head_end], command[head_end:]
+        for old, new in substitutions:
+            quoted = shlex.quote(new) if _UNSAFE_CHAR(new) else new
+
+            def _splice(m, raw=new, q=quoted):
+                src, start, end = m.string, m.start(), m.end()
+                before = src[start - 1] if start else ''
+                if before in "'\"" and end < len(src) and src[end] == before:
+                    return raw
+                return q
+
+            pattern = r"(?<![^\s'\"])" + re.escape(old) + r"(?![^\s'\"])"
+            out = re.sub(pattern, _splice, out, count=1)
+        return head + out
+
+    def _resolve(self, part: str, working_directory: str, actual_files: List[str],
+                 lower_map: dict, files_set: frozenset) -> str:
+        """Resolve a single token against the directory listing."""
+        # Known present in the listing: no stat needed at all
+        if part in files_set:
+            return part
+
+        # Check if path exists as-is
+        full_path = os.path.join(working_directory, part)
+        if os.path.exists(full_path):
+            # It exists, but on case-insensitive filesystems (macOS/Windows),
+            # the casing might still be "wrong" compared to the actual file.
+            if os.sep not in part and '/' not in part:
+                # Exists but not exact match in root, and no separators -> likely case mismatch
+                case_match = lower_map.get(part.lower())
                 if case_match:
-                    corrected_parts.append(case_match)
-                    modified = True
-                else:
-                    corrected_parts.append(part)
-        
-        if modified:
-            return shlex.join(corrected_parts)
-        
-        return command
+                    return case_match
+                return part
+            # Path with separators, or not found in listdir (hidden?), keep as is
+            return part
+
+        # Not found, try fuzzy match
+        if _rf_process is not None:
+            match = _rf_process.extractOne(
+                part, actual_files, scorer=fuzz.ratio,
+                score_cutoff=self.cutoff * 100,
+            )
+            matches = [match[0]] if match is not None else []
+        else:
+            matches = difflib.get_close_matches(part, actual_files, n=1, cutoff=self.cutoff)
+
+        if matches:
+            # We found a close match!
+            # But wait, is it a better match than just a case-insensitive check?
+            # Prioritize case-insensitive exact match
+            case_match = lower_map.get(part.lower())
+            if case_match:
+                return case_match
+            return matches[0]
+
+        # Try case-insensitive as a fallback even if fuzzy failed high cutoff
+        case_match = lower_map.get(part.lower())
+        if case_match:
+            return case_match
+        return part
 
     def _find_case_insensitive(self, target: str, options: List[str]) -> Optional[str]:
         """Find an exact case-insensitive match."""
@@ -2,24 +2,302 @@
 Command executor for safe shell execution.
 """
 
+import functools
+import selectors
 import subprocess
+from collections import Counter
 import time
 import os
+import re
 import shlex
-from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
-@dataclass
 class ExecutionResult:
-    """Represents the result of a command execution."""
-    command: str
-    stdout: str
-    stderr: str
-    exit_code: int
-    execution_time: float
-    timestamp: datetime
+    """
+    Represents the result of a command execution.
+
+    stdout/stderr accept either str or bytes; bytes are decoded lazily
+    on first access, so callers that never render a stream (history
+    bookkeeping, exit-code checks) skip the UTF-8 decode of large
+    outputs entirely. __slots__ keeps the footprint of the previous
+    slotted dataclass.
+    """
+
+    __slots__ = ('command', 'exit_code', 'execution_time', 'timestamp',
+                 '_stdout', '_stderr')
+
+    def __init__(self, command: str, stdout, stderr, exit_code: int,
+                 execution_time: float, timestamp: datetime):
+        self.command = command
+        self._stdout = stdout
+        self._stderr = stderr
+        self.exit_code = exit_code
+        self.execution_time = execution_time
+        self.timestamp = timestamp
+
+    @property
+    def stdout(self) -> str:
+        if isinstance(self._stdout, bytes):
+            # Decode once, then cache the str in place of the bytes
+            self._stdout = self._stdout.decode('utf-8', errors='replace')
+        return self._stdout
+
+    @property
+    def stderr(self) -> str:
+        if isinstance(self._stderr, bytes):
+            self._stderr = self._stderr.decode('utf-8', errors='replace')
+        return self._stderr
+
+    @property
+    def stdout_bytes(self) -> bytes:
+        """Raw stdout, for callers that write bytes straight to a stream."""
+        if isinstance(self._stdout, bytes):
+            return self._stdout
+        return self._stdout.encode()
+
+    @property
+    def stderr_bytes(self) -> bytes:
+        """Raw stderr, for callers that write bytes straight to a stream."""
+        if isinstance(self._stderr, bytes):
+            return self._stderr
+        return self._stderr.encode()
+
+    def __repr__(self) -> str:
+        return (f"ExecutionResult(command={self.command!r}, "
+                f"exit_code={self.exit_code}, "
+                f"execution_time={self.execution_time!r})")
+
+
+# Commands may not start with a pipe or redirect, nor end with a pipe;
+# one compiled pattern covers all four edge checks in a single C-level match
+_INVALID_EDGE_RE = re.compile(r'^[|<>]|\|$')
+
+
+@functools.lru_cache(maxsize=512)
+def _validate_syntax(command: str) -> bool:
+    """
+    validate_syntax body, memoized per command string.
+
+    Validation is a pure function of the string, so repeated invocations
+    (common in a REPL) short-circuit to a cache lookup instead of
+    re-scanning the command. Same pattern as corrector._split.
+    """
+    if not command or not command.strip():
+        return False
+    
+    command = command.strip()
+    
+    # One tally pass instead of eight separate count() scans, then
+    # straight-line comparisons with no per-check lambda call
+    cnt = Counter(command)
+
+    # Unmatched quotes
+    if cnt['"'] % 2 != 0 or cnt["'"] % 2 != 0:
+        return False
+
+    # Unmatched parentheses/brackets
+    if cnt['('] != cnt[')'] or cnt['['] != cnt[']'] or cnt['{'] != cnt['}']:
+        return False
+
+    # Invalid pipe/redirect placement at either end of the command
+    if _INVALID_EDGE_RE.search(command):
+        return False
+    if '|||' in command:  # runs of three or more pipes are never valid shell
+        return False
+    
+    # Try to parse with shlex (basic shell syntax check)
+    try:
+        # This will catch some basic syntax errors
+        # Note: We don't use the result, just checking if it parses
+        shlex.split(command, posix=True)
+    except ValueError:
+        # shlex.split raises ValueError for unclosed quotes and similar issues
+        return False
+    
+    return True
+
+
+# Characters that force a real shell: pipes, logic, redirection,
+# expansion, globbing, subshells, escapes. Plain argv commands avoid
+# spawning /bin/sh at all.
+_SHELL_META = frozenset('|&;<>$`*?[](){}~\\\n')
+
+
+@functools.lru_cache(maxsize=512)
+def _simple_argv(command: str) -> Optional[tuple]:
+    """
+    Split a command into argv when it needs no shell, else None.
+
+    Cached alongside the validation result so the split isn't recomputed
+    on repeat invocations; returns a tuple so cached values are immutable.
+    """
+    if not _SHELL_META.isdisjoint(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or '=' in argv[0]:
+        # leading VAR=value assignments are shell syntax
+        return None
+    return tuple(argv)
+
+
+# Home directory resolved once per process; every bare `cd` would
+# otherwise re-read the environment (and possibly pwd) via expanduser
+_HOME = os.environ.get('HOME') or os.path.expanduser('~')
+
+# Streaming read parameters: drain pipes in 64 KiB chunks and stop
+# keeping output past 16 MiB so a runaway command can't pin memory
+_STREAM_CHUNK = 65536
+_OUTPUT_CAP = 16 * 1024 * 1024
+_TRUNCATION_NOTICE = "\n[output truncated at 16 MiB]"
+
+
+def _run_streaming(args, shell: bool, cwd: str, timeout: float) -> tuple:
+    """
+    Run a command, draining stdout/stderr incrementally.
+
+    Unlike subprocess.run(capture_output=True), which materializes both
+    streams as unbounded strings, this reads the pipes chunk-wise via a
+    selector, accumulates into bytearrays (amortized O(1) extend), caps
+    retained output, and leaves decoding to the caller.
+
+    Returns:
+        (returncode, stdout, stderr) with output as bytes
+
+    Raises:
+        subprocess.TimeoutExpired: If the command outlives the timeout;
+            carries whatever output was collected, as bytes
+    """
+    proc = subprocess.Popen(
+        args,
+        shell=shell,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    buffers = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+    truncated = {proc.stdout: False, proc.stderr: False}
+    deadline = time.monotonic() + timeout
+
+    def _timed_out():
+        proc.kill()
+        proc.wait()
+        return subprocess.TimeoutExpired(
+            args, timeout,
+            output=bytes(buffers[proc.stdout]),
+            stderr=bytes(buffers[proc.stderr]),
+        )
+
+    # poll() beats DefaultSelector (epoll) here: epoll costs an extra fd
+    # plus epoll_create/ctl/close syscalls per command, which only pays
+    # off when watching many fds — we always watch exactly two
+    sel = getattr(selectors, "PollSelector", selectors.DefaultSelector)()
+    sel.register(proc.stdout, selectors.EVENT_READ)
+    sel.register(proc.stderr, selectors.EVENT_READ)
+    try:
+        open_streams = 2
+        while open_streams:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _timed_out()
+            for key, _ in sel.select(remaining):
+                chunk = os.read(key.fileobj.fileno(), _STREAM_CHUNK)
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    open_streams -= 1
+                    continue
+                buf = buffers[key.fileobj]
+                if len(buf) < _OUTPUT_CAP:
+                    buf.extend(chunk)
+                elif not truncated[key.fileobj]:
+                    # Keep draining so the child never blocks on a full
+                    # pipe, but stop retaining what it writes
+                    truncated[key.fileobj] = True
+    finally:
+        sel.close()
+
+    try:
+        returncode = proc.wait(max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        raise _timed_out() from None
+
+    # Return raw bytes; ExecutionResult decodes lazily on first access
+    out = bytes(buffers[proc.stdout])
+    err = bytes(buffers[proc.stderr])
+    if truncated[proc.stdout]:
+        out += _TRUNCATION_NOTICE.encode()
+    if truncated[proc.stderr]:
+        err += _TRUNCATION_NOTICE.encode()
+    return returncode, out, err
+
+
+def _fmt_timeout(e, command):
+    stdout = e.stdout.decode() if e.stdout else ""
+    return stdout, (
+        f"Command timed out after 300 seconds\n"
+        f"  • The command may be waiting for input\n"
+        f"  • Try running with a shorter timeout or in the background\n"
+        f"  • Command: {command}"
+    )
+
+
+def _fmt_permission(e, command):
+    return "", (
+        f"Permission denied: {str(e)}\n"
+        f"  • You may need elevated privileges (sudo)\n"
+        f"  • Check file/directory permissions\n"
+        f"  • Command: {command}"
+    )
+
+
+def _fmt_not_found(e, command):
+    return "", (
+        f"Command or file not found: {str(e)}\n"
+        f"  • Check if the command is installed\n"
+        f"  • Verify the file path is correct\n"
+        f"  • Command: {command}"
+    )
+
+
+def _fmt_os_error(e, command):
+    return "", (
+        f"Operating system error: {str(e)}\n"
+        f"  • The system could not execute the command\n"
+        f"  • Check system resources and permissions\n"
+        f"  • Command: {command}"
+    )
+
+
+def _fmt_unexpected(e, command):
+    return "", (
+        f"Unexpected execution error: {str(e)}\n"
+        f"  • An unknown error occurred\n"
+        f"  • Command: {command}\n"
+        f"  • Error type: {type(e).__name__}"
+    )
+
+
+# Requirement 7.1, 7.3, 7.4: one formatter per failure class, checked in
+# order (subclasses before OSError, Exception as the catch-all)
+_ERROR_FORMATTERS = (
+    (subprocess.TimeoutExpired, _fmt_timeout),
+    (PermissionError, _fmt_permission),
+    (FileNotFoundError, _fmt_not_found),
+    (OSError, _fmt_os_error),
+    (Exception, _fmt_unexpected),
+)
+
+
+def _format_execution_error(e, command):
+    """Map an execution failure to its (stdout, stderr message) pair."""
+    for exc_type, fmt in _ERROR_FORMATTERS:
+        if isinstance(e, exc_type):
+            return fmt(e, command)
+    return _fmt_unexpected(e, command)
 
 
 class CommandExecutor:
@@ -44,50 +322,7 @@ class CommandExecutor:
         Returns:
             True if command appears valid, False otherwise
         """
-        if not command or not command.strip():
-            return False
-        
-        command = command.strip()
-        
-        # Check for obviously invalid patterns
-        invalid_patterns = [
-            # Unmatched quotes
-            lambda c: c.count('"') % 2 != 0,
-            lambda c: c.count("'") % 2 != 0,
-            
-            # Unmatched parentheses/brackets
-            lambda c: c.count('(') != c.count(')'),
-            lambda c: c.count('[') != c.count(']'),
-            lambda c: c.count('{') != c.count('}'),
-            
-            # Invalid pipe usage
-            lambda c: c.startswith('|'),
-            lambda c: c.endswith('|'),
-            lambda c: '||' in c.replace('||', ''),  # Check for single | not part of ||
-            
-            # Invalid redirection
-            lambda c: c.startswith('>'),
-            lambda c: c.startswith('<'),
-        ]
-        
-        for check in invalid_patterns:
-            try:
-                if check(command):
-                    return False
-            except Exception:
-                # If any check fails, consider it invalid
-                return False
-        
-        # Try to parse with shlex (basic shell syntax check)
-        try:
-            # This will catch some basic syntax errors
-            # Note: We don't use the result, just checking if it parses
-            shlex.split(command, posix=True)
-        except ValueError:
-            # shlex.split raises ValueError for unclosed quotes and similar issues
-            return False
-        
-        return True
+        return _validate_syntax(command)
     
     def execute(self, command: str) -> ExecutionResult:
         """
@@ -102,163 +337,212 @@ class CommandExecutor:
         Raises:
             ValueError: If command validation fails or command is empty
         """
-        # Validate command is not empty
-        if not command or not command.strip():
+        # Strip exactly once; every later check works on the local
+        stripped = command.strip()
+        if not stripped:
             raise ValueError("Command cannot be empty")
-        
-        # Validate command syntax
-        if not self.validate_syntax(command):
+
+        # Validate command syntax (pre-stripped keys also dedupe the
+        # validation cache across whitespace variants)
+        if not self.validate_syntax(stripped):
             raise ValueError(
                 f"Invalid command syntax: {command}\n"
                 "  • Check for unmatched quotes or brackets\n"
                 "  • Verify pipe and redirection usage"
             )
-        
+
         timestamp = datetime.now()
-        start_time = time.time()
-        
+        # Monotonic integer clock: immune to NTP steps, no float math
+        # until the final conversion to seconds
+        start_ns = time.perf_counter_ns()
+
         # Special handling for cd command
-        if command.strip().startswith('cd '):
-            return self._execute_cd(command, timestamp, start_time)
+        if stripped.startswith('cd ') or stripped == 'cd':
+            return self._execute_cd(stripped, timestamp, start_ns)
         
         try:
-            # Execute command in the working directory
-            # shell=True allows for complex commands with pipes, redirects, etc.
-            # We capture both stdout and stderr separately
-            result = subprocess.run(
-                command,
-                shell=True,
+            # Execute command in the working directory.
+            # Simple argv commands run without a shell — subprocess uses
+            # posix_spawn for the direct case, saving the extra /bin/sh
+            # fork+exec; anything with metacharacters still gets shell=True
+            # for pipes, redirects, etc. Both capture stdout and stderr.
+            argv = _simple_argv(command)
+            returncode, stdout, stderr = _run_streaming(
+                argv if argv is not None else command,
+                shell=argv is None,
                 cwd=self.working_directory,
-                capture_output=True,
-                text=True,
                 timeout=300  # 5 minute timeout for long-running commands
             )
             
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             
             return ExecutionResult(
                 command=command,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                exit_code=result.returncode,
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=returncode,
                 execution_time=execution_time,
                 timestamp=timestamp
             )
             
-        except subprocess.TimeoutExpired as e:
-            # Requirement 7.3: Provide helpful context for timeout errors
-            execution_time = time.time() - start_time
-            stderr_msg = (
-                f"Command timed out after 300 seconds\n"
-                f"  • The command may be waiting for input\n"
-                f"  • Try running with a shorter timeout or in the background\n"
-                f"  • Command: {command}"
-            )
-            return ExecutionResult(
-                command=command,
-                stdout=e.stdout.decode() if e.stdout else "",
-                stderr=stderr_msg,
-                exit_code=-1,
-                execution_time=execution_time,
-                timestamp=timestamp
-            )
-        
-        except PermissionError as e:
-            # Requirement 7.3: Specific error for permission issues
-            execution_time = time.time() - start_time
-            stderr_msg = (
-                f"Permission denied: {str(e)}\n"
-                f"  • You may need elevated privileges (sudo)\n"
-                f"  • Check file/directory permissions\n"
-                f"  • Command: {command}"
-            )
+        except Exception as e:
+            # Requirement 7.1, 7.3, 7.4: table-driven formatting replaces
+            # five near-identical except blocks
+            stdout, stderr_msg = _format_execution_error(e, command)
             return ExecutionResult(
                 command=command,
-                stdout="",
+                stdout=stdout,
                 stderr=stderr_msg,
                 exit_code=-1,
-                execution_time=execution_time,
+                execution_time=(time.perf_counter_ns() - start_ns) / 1e9,
                 timestamp=timestamp
             )
-        
-        except FileNotFoundError as e:
-            # Requirement 7.3: Specific error for missing commands/files
-            execution_time = time.time() - start_time
-            stderr_msg = (
-                f"Command or file not found: {str(e)}\n"
-                f"  • Check if the command is installed\n"
-                f"  • Verify the file path is correct\n"
-                f"  • Command: {command}"
-            )
-            return ExecutionResult(
-                command=command,
-                stdout="",
-                stderr=stderr_msg,
-                exit_code=-1,
-                execution_time=execution_time,
-                timestamp=timestamp
-            )
-        
-        except OSError as e:
-            # Requirement 7.3: OS-level errors
-            execution_time = time.time() - start_time
-            stderr_msg = (
-                f"Operating system error: {str(e)}\n"
-                f"  • The system could not execute the command\n"
-                f"  • Check system resources and permissions\n"
-                f"  • Command: {command}"
+    
+    async def execute_async(self, command: str) -> ExecutionResult:
+        """
+        Asynchronous counterpart of execute().
+
+        Awaiting the child through asyncio lets many commands overlap
+        their wait time on one event loop instead of pinning a thread per
+        command for up to the full timeout. Validation, cd handling, and
+        result shape match execute().
+
+        Args:
+            command: The shell command to execute
+
+        Returns:
+            ExecutionResult containing stdout, stderr, exit code, and execution time
+
+        Raises:
+            ValueError: If command validation fails or command is empty
+        """
+        import asyncio
+
+        stripped = command.strip()
+        if not stripped:
+            raise ValueError("Command cannot be empty")
+
+        if not self.validate_syntax(stripped):
+            raise ValueError(
+                f"Invalid command syntax: {command}\n"
+                "  • Check for unmatched quotes or brackets\n"
+                "  • Verify pipe and redirection usage"
             )
+
+        timestamp = datetime.now()
+        # Monotonic integer clock: immune to NTP steps, no float math
+        # until the final conversion to seconds
+        start_ns = time.perf_counter_ns()
+
+        if stripped.startswith('cd ') or stripped == 'cd':
+            # cd only touches process state; no subprocess involved
+            return self._execute_cd(stripped, timestamp, start_ns)
+
+        try:
+            argv = _simple_argv(command)
+            if argv is not None:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    cwd=self.working_directory,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            else:
+                proc = await asyncio.create_subprocess_shell(
+                    command,
+                    cwd=self.working_directory,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            try:
+                out, err = await asyncio.wait_for(proc.communicate(), 300)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise subprocess.TimeoutExpired(command, 300) from None
+
             return ExecutionResult(
                 command=command,
-                stdout="",
-                stderr=stderr_msg,
-                exit_code=-1,
-                execution_time=execution_time,
+                stdout=out,
+                stderr=err,
+                exit_code=proc.returncode,
+                execution_time=(time.perf_counter_ns() - start_ns) / 1e9,
                 timestamp=timestamp
             )
-        
+
         except Exception as e:
-            # Requirement 7.1, 7.4: Catch all other unexpected errors
-            execution_time = time.time() - start_time
-            stderr_msg = (
-                f"Unexpected execution error: {str(e)}\n"
-                f"  • An unknown error occurred\n"
-                f"  • Command: {command}\n"
-                f"  • Error type: {type(e).__name__}"
-            )
+            stdout, stderr_msg = _format_execution_error(e, command)
             return ExecutionResult(
                 command=command,
-                stdout="",
+                stdout=stdout,
                 stderr=stderr_msg,
                 exit_code=-1,
-                execution_time=execution_time,
+                execution_time=(time.perf_counter_ns() - start_ns) / 1e9,
                 timestamp=timestamp
             )
-    
-    def _execute_cd(self, command: str, timestamp: datetime, start_time: float) -> ExecutionResult:
+
+    def execute_many(self, commands: List[str], max_workers: Optional[int] = None) -> List[ExecutionResult]:
+        """
+        Execute several independent commands concurrently.
+
+        Each command waits mostly on its subprocess, so threads overlap
+        that wall-clock time; results come back in input order. Commands
+        must be independent: a `cd` in the batch updates
+        self.working_directory at an arbitrary point relative to its
+        siblings, so directory changes belong in their own sequential
+        call, not in a batch.
+
+        Args:
+            commands: Commands to execute.
+            max_workers: Thread pool size; defaults to
+                min(32, (os.cpu_count() or 1) * 4).
+
+        Returns:
+            ExecutionResults in the same order as the input commands.
+        """
+        if not commands:
+            return []
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.execute, commands))
+
+    def _execute_cd(self, command: str, timestamp: datetime, start_ns: int) -> ExecutionResult:
         """
         Special handler for cd commands to actually change the working directory.
         
         Args:
             command: The cd command
             timestamp: Command start timestamp
-            start_time: Command start time
+            start_ns: Command start time from time.perf_counter_ns()
             
         Returns:
             ExecutionResult for the cd operation
         """
-        import shlex
-        
         try:
-            # Parse the cd command
-            parts = shlex.split(command)
-            if len(parts) < 2:
+            stripped = command.strip()
+            if stripped == 'cd':
+                # Bare cd is a very common keystroke: jump straight to the
+                # cached home directory with no parsing at all
+                target = None
+            else:
+                # Parse the cd command; the common quote-free case takes
+                # the first whitespace-separated word directly, skipping
+                # shlex
+                rest = stripped[3:].strip()
+                if '"' not in rest and "'" not in rest and '\\' not in rest:
+                    target = rest.split(None, 1)[0] if rest else None
+                else:
+                    parts = shlex.split(command)
+                    target = parts[1] if len(parts) > 1 else None
+
+            if target is None:
                 # Just "cd" with no args - go to home directory
-                target_dir = os.path.expanduser("~")
+                target_dir = _HOME
             else:
-                target_dir = parts[1]
                 # Expand ~ and environment variables
-                target_dir = os.path.expanduser(target_dir)
+                target_dir = os.path.expanduser(target)
                 target_dir = os.path.expandvars(target_dir)
             
             # Make it absolute if relative
@@ -275,22 +559,26 @@ class CommandExecutor:
                 basename = os.path.basename(target_dir)
                 
                 if os.path.isdir(parent):
+                    # scandir entries answer is_dir() from readdir data,
+                    # skipping the per-candidate join + stat round-trip
+                    wanted = basename.lower()
                     try:
-                        entries = os.listdir(parent)
-                        for entry in entries:
-                            if entry.lower() == basename.lower():
-                                full_path = os.path.join(parent, entry)
-                                if os.path.isdir(full_path):
-                                    target_dir = full_path
+                        with os.scandir(parent) as entries:
+                            for entry in entries:
+                                if entry.name.lower() == wanted and entry.is_dir():
+                                    target_dir = entry.path
                                     break
                     except OSError:
                         pass
             
-            # Try to change directory
+            # Track the directory in Python state only: subprocesses already
+            # receive cwd=self.working_directory, so mutating the parent
+            # process with os.chdir bought nothing and leaked the change to
+            # every other executor (and thread) in the process. realpath
+            # resolves symlinks once, matching what os.getcwd() returned.
             if os.path.isdir(target_dir):
-                os.chdir(target_dir)
-                self.working_directory = os.getcwd()
-                execution_time = time.time() - start_time
+                self.working_directory = os.path.realpath(target_dir)
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 return ExecutionResult(
                     command=command,
@@ -301,7 +589,7 @@ class CommandExecutor:
                     timestamp=timestamp
                 )
             else:
-                execution_time = time.time() - start_time
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                 return ExecutionResult(
                     command=command,
                     stdout="",
@@ -311,8 +599,10 @@ class CommandExecutor:
                     timestamp=timestamp
                 )
                 
-        except Exception as e:
-            execution_time = time.time() - start_time
+        except (OSError, ValueError) as e:
+            # Only filesystem errors and bad-path values are expected here;
+            # anything else is a programming bug and should propagate
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             return ExecutionResult(
                 command=command,
                 stdout="",
@@ -345,3 +635,221 @@ class CommandExecutor:
             raise ValueError(f"Directory does not exist: {directory}")
         
         self.working_directory = os.path.abspath(directory)
+
+
+# Commands safe to serve from cache: read-only queries whose output is a
+# near-pure function of the working directory over short windows
+_CACHEABLE_EXACT = frozenset({
+    'git status', 'git log', 'ls', 'pwd', 'whoami', 'uname', 'hostname',
+})
+
+
+class CachedCommandExecutor(CommandExecutor):
+    """
+    CommandExecutor that memoizes read-only commands for a short TTL.
+
+    Repeats of allowlisted queries (git status, ls, which, --version
+    checks) within the TTL return the previous ExecutionResult without
+    spawning a process. Entries are keyed on the working directory, so a
+    cd naturally misses, and only successful results are cached. The
+    cache lives in-process: the CLI is one long-lived REPL, which is
+    where the repeats actually happen, and that avoids dragging in an
+    on-disk store dependency.
+    """
+
+    _CACHE_MAX = 256
+
+    def __init__(self, working_directory: Optional[str] = None, ttl: float = 5.0):
+        """
+        Initialize the caching executor.
+
+        Args:
+            working_directory: Directory to execute commands in. If None, uses current directory.
+            ttl: Seconds a cached result stays valid.
+        """
+        super().__init__(working_directory)
+        self.ttl = ttl
+        self._result_cache: dict = {}
+
+    @staticmethod
+    def _cacheable(command: str) -> bool:
+        """Whether a command is on the read-only allowlist."""
+        c = command.strip()
+        return (
+            c in _CACHEABLE_EXACT
+            or c.startswith('which ')
+            or c.endswith('--version')
+        )
+
+    def execute(self, command: str) -> ExecutionResult:
+        """
+        Execute a command, serving allowlisted repeats from cache.
+
+        Args:
+            command: The shell command to execute
+
+        Returns:
+            ExecutionResult (possibly cached) for the command
+        """
+        if not self._cacheable(command):
+            return super().execute(command)
+
+        key = (self.working_directory, command)
+        now = time.monotonic()
+        hit = self._result_cache.get(key)
+        if hit is not None and now - hit[0] < self.ttl:
+            return hit[1]
+
+        result = super().execute(command)
+        if result.exit_code == 0:
+            if len(self._result_cache) >= self._CACHE_MAX:
+                self._result_cache.clear()
+            self._result_cache[key] = (now, result)
+        return result
+
+
+class ShellCoprocessExecutor(CommandExecutor):
+    """
+    CommandExecutor that feeds commands to one long-lived bash coprocess.
+
+    Forking a fresh shell dominates subprocess overhead for short
+    commands; this spawns /bin/bash once and frames each command with a
+    unique sentinel on both streams, so N commands cost one shell spawn
+    instead of N. Opt-in because the trade-offs are real: commands share
+    the coprocess's environment, stdin is rebound to /dev/null (a
+    command that reads the terminal would otherwise eat the command
+    stream), and a command that leaves a background writer attached to
+    the pipes can smear output into the next call. Any coprocess failure
+    falls back to the per-command spawn path.
+    """
+
+    _COPROC_TIMEOUT = 300
+
+    def __init__(self, working_directory: Optional[str] = None):
+        super().__init__(working_directory)
+        self._shell: Optional[subprocess.Popen] = None
+        self._serial = 0
+
+    def _ensure_shell(self) -> subprocess.Popen:
+        """Start (or restart) the coprocess."""
+        if self._shell is None or self._shell.poll() is not None:
+            self._shell = subprocess.Popen(
+                ['/bin/bash', '--norc', '-s'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.working_directory,
+                bufsize=0,
+            )
+        return self._shell
+
+    def _kill_shell(self) -> None:
+        if self._shell is not None:
+            try:
+                self._shell.kill()
+                self._shell.wait()
+            except OSError:
+                pass
+            self._shell = None
+
+    def execute(self, command: str) -> ExecutionResult:
+        """
+        Execute a command inside the shared shell coprocess.
+
+        Validation, cd handling, and the result shape match execute();
+        coprocess breakage falls back to the per-command spawn.
+        """
+        stripped = command.strip()
+        if not stripped:
+            raise ValueError("Command cannot be empty")
+        if not self.validate_syntax(stripped):
+            raise ValueError(
+                f"Invalid command syntax: {command}\n"
+                "  • Check for unmatched quotes or brackets\n"
+                "  • Verify pipe and redirection usage"
+            )
+
+        timestamp = datetime.now()
+        start_ns = time.perf_counter_ns()
+
+        if stripped.startswith('cd ') or stripped == 'cd':
+            return self._execute_cd(stripped, timestamp, start_ns)
+
+        try:
+            return self._run_in_shell(command, timestamp, start_ns)
+        except Exception:
+            # Sentinel parse failure, broken pipe, dead shell: respawn
+            # next time and run this command the slow, reliable way
+            self._kill_shell()
+            return super().execute(command)
+
+    def _run_in_shell(self, command: str, timestamp: datetime, start_ns: int) -> ExecutionResult:
+        """Frame one command with sentinels and collect both streams."""
+        shell = self._ensure_shell()
+        self._serial += 1
+        token = f"__HT_SENTINEL_{os.getpid()}_{self._serial}__"
+        marker = token.encode()
+
+        # stdin rebound to /dev/null so the command can't consume the
+        # command stream; cwd pinned per command so cd tracking holds
+        script = (
+            f"cd {shlex.quote(self.working_directory)} 2>/dev/null\n"
+            f"{{ {command}\n}} </dev/null\n"
+            f"printf '\\n%s %d\\n' {token} $? \n"
+            f"printf '\\n%s\\n' {token} >&2\n"
+        )
+        shell.stdin.write(script.encode())
+        shell.stdin.flush()
+
+        out_buf = bytearray()
+        err_buf = bytearray()
+        deadline = time.monotonic() + self._COPROC_TIMEOUT
+        sel = getattr(selectors, "PollSelector", selectors.DefaultSelector)()
+        sel.register(shell.stdout, selectors.EVENT_READ)
+        sel.register(shell.stderr, selectors.EVENT_READ)
+        try:
+            while marker not in out_buf or marker not in err_buf:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._kill_shell()
+                    stdout, stderr_msg = _fmt_timeout(
+                        subprocess.TimeoutExpired(command, self._COPROC_TIMEOUT,
+                                                  output=bytes(out_buf)),
+                        command,
+                    )
+                    return ExecutionResult(
+                        command=command,
+                        stdout=stdout,
+                        stderr=stderr_msg,
+                        exit_code=-1,
+                        execution_time=(time.perf_counter_ns() - start_ns) / 1e9,
+                        timestamp=timestamp,
+                    )
+                for key, _ in sel.select(remaining):
+                    chunk = os.read(key.fileobj.fileno(), _STREAM_CHUNK)
+                    if not chunk:
+                        raise BrokenPipeError("shell coprocess closed its pipes")
+                    if key.fileobj is shell.stdout:
+                        out_buf.extend(chunk)
+                    else:
+                        err_buf.extend(chunk)
+        finally:
+            sel.close()
+
+        # Output is everything before the newline we printed ahead of the
+        # sentinel; the exit code rides on the stdout sentinel line
+        out_idx = out_buf.index(marker)
+        err_idx = err_buf.index(marker)
+        status_line = out_buf[out_idx:].split(b'\n', 1)[0]
+        exit_code = int(status_line.split()[-1])
+        stdout = bytes(out_buf[:max(0, out_idx - 1)])
+        stderr = bytes(err_buf[:max(0, err_idx - 1)])
+
+        return ExecutionResult(
+            command=command,
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            execution_time=(time.perf_counter_ns() - start_ns) / 1e9,
+            timestamp=timestamp,
+        )
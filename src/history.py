@@ -2,14 +2,126 @@
 History manager for persisting and retrieving command history using SQLite.
 """
 
-import sqlite3
+try:
+    # Drop-in stdlib replacement bundling a modern SQLite; picks up FTS5
+    # and newer planner heuristics on distros whose system library lacks
+    # them. Everything below speaks plain DB-API either way.
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
+from urllib.parse import quote
 import os
 
 
+# Bundle of the reads the REPL needs at the start of every turn
+TurnContext = namedtuple("TurnContext", "suggestions rejections")
+
+
+def _tune_connection(conn: sqlite3.Connection) -> None:
+    """
+    Apply performance pragmas to a fresh connection.
+
+    WAL lets readers proceed while a writer commits, NORMAL synchronous
+    drops the per-commit fsync that FULL imposes (safe under WAL),
+    busy_timeout avoids immediate 'database is locked' errors when two
+    CLI instances overlap, and a 20 MB page cache keeps the suggestion
+    queries' working set in memory. journal_mode persists in the
+    database file; the rest are per-connection and cheap to re-issue.
+    """
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Lets the retention triggers' deletes fire the FTS sync triggers
+        conn.execute("PRAGMA recursive_triggers=ON")
+        conn.execute("PRAGMA mmap_size=268435456")
+    except sqlite3.Error:
+        # Pragmas are an optimization; never fail the caller over them
+        pass
+
+
+def _now_us() -> int:
+    """Current wall-clock time as integer epoch-microseconds."""
+    return time.time_ns() // 1000
+
+
+def _ts_to_dt(value) -> datetime:
+    """
+    Convert a stored timestamp to datetime.
+
+    Rows written since the user_version=1 migration hold integer
+    epoch-microseconds; the string branch covers any ISO text that
+    slipped past the migration.
+    """
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value / 1_000_000)
+
+
+def _history_row_factory(cursor, row) -> "HistoryEntry":
+    """
+    Materialize a HistoryEntry straight from a SQLite row.
+
+    Installed per-cursor on the history SELECTs so rows skip the
+    intermediate tuple + comprehension pass; works for every history
+    query because they all put the seven entry columns first.
+    """
+    return HistoryEntry(
+        id=row[0],
+        natural_language=row[1],
+        shell_command=row[2],
+        working_directory=row[3],
+        exit_code=row[4],
+        timestamp=_ts_to_dt(row[5]),
+        execution_time=row[6],
+    )
+
+
+# DML shared by several methods, hoisted so every call site passes the
+# identical string: the connection's prepared-statement cache is keyed on
+# the SQL text, so whitespace-variant copies each burned their own slot
+_SQL_INSERT_HISTORY = """
+    INSERT INTO command_history
+    (natural_language, shell_command, working_directory, exit_code, timestamp, execution_time)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_REJECTION = """
+    INSERT INTO rejected_commands (natural_language, shell_command, timestamp)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_DELETE_REJECTIONS = "DELETE FROM rejected_commands WHERE natural_language = ?"
+
+# Retention bounds: suggestion queries scale with table size, so both
+# tables are trimmed oldest-first once they outgrow their cap
+_HISTORY_CAP = 50000
+_REJECTION_CAP = 5000
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 prefix query: word1* OR word2* ...
+
+    Each token is quoted so user input can't inject FTS syntax; None
+    means there is nothing to match on and the caller should use its
+    LIKE fallback.
+    """
+    tokens = text.split()
+    if not tokens:
+        return None
+    return " OR ".join('"{}"*'.format(t.replace('"', '""')) for t in tokens)
+
+
 @dataclass
 class HistoryEntry:
     """Represents a command history entry."""
@@ -40,8 +152,127 @@ class HistoryManager:
             db_path = str(haunted_dir / "history.db")
         
         self.db_path = db_path
+        # One long-lived connection shared by all threads; SQLite keeps a
+        # per-connection prepared-statement cache, so reusing the handle
+        # avoids re-parsing the same SQL on every call. The lock serializes
+        # access between the REPL thread and the background writer.
+        self._conn: Optional[sqlite3.Connection] = None
+        # Signature of the database file on disk; if it changes outside our
+        # own writes (deleted, replaced, corrupted) the handle is reopened
+        # so errors surface instead of hitting stale cached pages
+        self._db_sig: Optional[tuple] = None
+        self._lock = threading.Lock()
+        # Separate read-only connection with its own lock: under WAL a
+        # reader never blocks behind the writer's commit, so suggestion
+        # lookups stay responsive while the background thread flushes
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._read_sig: Optional[tuple] = None
+        self._read_lock = threading.Lock()
+        # Writes queued by the REPL, flushed in one transaction; see flush().
+        # deque append/popleft are atomic, so the background writer and the
+        # interactive thread can share it without a lock
+        self._pending_writes: deque = deque()
+        self._write_event = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        # Set by initialize_db if this SQLite build has FTS5; read paths
+        # fall back to the LIKE scan when it doesn't
+        self._fts_enabled = False
+        # Set by initialize_db if the frequency rollup table could be set
+        # up (needs upsert-in-trigger support, SQLite >= 3.35); the
+        # directory suggestion query falls back to grouping the raw
+        # history when it couldn't
+        self._stats_enabled = False
+        # Write-through caches for the per-prompt point lookups; None
+        # records a confirmed miss so absent keys don't requery. reload()
+        # drops both if another process changes the tables underneath us.
+        self._pref_cache: dict = {}
+        self._alias_cache: dict = {}
+        # True once the alias cache holds the whole table, letting
+        # list_aliases answer from memory
+        self._aliases_complete = False
         self.initialize_db()
-    
+
+    def _refresh(self, conn: Optional[sqlite3.Connection], old_sig: Optional[tuple],
+                 opener) -> tuple:
+        """
+        Reopen ``conn`` via ``opener`` if the database file changed on disk.
+
+        Shared by the writer and reader handles; call with the matching
+        lock held. The stat is the same mtime-style invalidation used
+        elsewhere in the codebase: one syscall per call instead of a full
+        connect, while external replacement or corruption of the file
+        still raises on next use rather than silently hitting SQLite's
+        cached pages.
+
+        Returns:
+            (connection, signature) to store back on the instance
+        """
+        try:
+            st = os.stat(self.db_path)
+            sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            sig = None
+        if conn is not None and sig == old_sig:
+            return conn, sig
+        # Validate the header before touching the old handle: closing a
+        # WAL connection checkpoints live pages back into the main file,
+        # which would paper over external corruption instead of
+        # surfacing it to the caller.
+        if sig is not None and st.st_size > 0:
+            try:
+                with open(self.db_path, "rb") as fh:
+                    header = fh.read(16)
+            except OSError:
+                header = b"SQLite format 3\x00"
+            if header != b"SQLite format 3\x00":
+                raise sqlite3.DatabaseError(
+                    f"file is not a database: {self.db_path}"
+                )
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        return opener(), sig
+
+    def _checked_conn(self) -> sqlite3.Connection:
+        """
+        Return the shared writer connection, reopening it if the database
+        file changed behind our back. Must be called with self._lock held.
+        """
+        self._conn, self._db_sig = self._refresh(self._conn, self._db_sig, self._connect)
+        return self._conn
+
+    def _checked_reader(self) -> sqlite3.Connection:
+        """
+        Return the shared read-only connection. Must be called with
+        self._read_lock held.
+        """
+        self._read_conn, self._read_sig = self._refresh(
+            self._read_conn, self._read_sig, self._connect_ro
+        )
+        return self._read_conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the standard performance pragmas applied."""
+        # check_same_thread=False because the handle is shared between the
+        # REPL thread and the background writer; self._lock serializes use
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=256)
+        _tune_connection(conn)
+        return conn
+
+    def _connect_ro(self) -> sqlite3.Connection:
+        """Open the read-only connection via a mode=ro URI."""
+        conn = sqlite3.connect(
+            f"file:{quote(self.db_path)}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        _tune_connection(conn)
+        return conn
+
     def initialize_db(self) -> None:
         """
         Create database schema if it doesn't exist.
@@ -50,9 +281,9 @@ class HistoryManager:
             sqlite3.Error: If database initialization fails
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                cursor = conn.cursor()
+            self._conn = self._connect()
+            with self._lock:
+                cursor = self._conn.cursor()
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS command_history (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -60,29 +291,41 @@ class HistoryManager:
                         shell_command TEXT NOT NULL,
                         working_directory TEXT NOT NULL,
                         exit_code INTEGER NOT NULL,
-                        timestamp DATETIME NOT NULL,
+                        timestamp INTEGER NOT NULL,
                         execution_time REAL NOT NULL
                     )
                 """)
                 
-                # Create index for faster similarity searches
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_natural_language 
-                    ON command_history(natural_language)
-                """)
+                # The old single-column natural_language index could never
+                # serve the leading-wildcard LIKE queries and taxed every
+                # INSERT with an extra B-tree update; FTS5 (below) handles
+                # natural-language lookup now
+                cursor.execute("DROP INDEX IF EXISTS idx_natural_language")
                 
                 # Create index for timestamp-based queries
                 cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_timestamp 
+                    CREATE INDEX IF NOT EXISTS idx_timestamp
                     ON command_history(timestamp DESC)
                 """)
+
+                # Composite indexes covering the GROUP BY shell_command /
+                # ORDER BY frequency, last_used suggestion queries, so
+                # grouping walks the index instead of sorting a temp B-tree
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cmd_nl_shell_ts
+                    ON command_history(natural_language, shell_command, timestamp DESC)
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cmd_wd_shell_ts
+                    ON command_history(working_directory, shell_command, timestamp DESC)
+                """)
                 
                 # Create aliases table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS aliases (
                         name TEXT PRIMARY KEY,
                         command TEXT NOT NULL,
-                        created_at DATETIME NOT NULL
+                        created_at INTEGER NOT NULL
                     )
                 """)
 
@@ -121,13 +364,83 @@ class HistoryManager:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         natural_language TEXT NOT NULL,
                         shell_command TEXT NOT NULL,
-                        timestamp DATETIME NOT NULL
+                        timestamp INTEGER NOT NULL
                     )
                 """)
                 
-                conn.commit()
-            finally:
-                conn.close()
+                # Full-text indexes over the natural-language columns;
+                # leading-wildcard LIKE can never use the B-tree indexes,
+                # so substring search was a full scan per query
+                self._fts_enabled = self._ensure_fts(cursor)
+
+                # Migrate legacy ISO-string timestamps to integer epoch
+                # microseconds: INTEGER ORDER BY beats TEXT collation and
+                # rows shrink. Mixed types would sort wrong (numbers before
+                # text), so old rows are rewritten once, gated on
+                # user_version. Millisecond precision is the best strftime
+                # offers; acceptable for historical rows.
+                if cursor.execute("PRAGMA user_version").fetchone()[0] < 1:
+                    for table, column in (("command_history", "timestamp"),
+                                          ("rejected_commands", "timestamp"),
+                                          ("aliases", "created_at")):
+                        cursor.execute(f"""
+                            UPDATE {table} SET {column} =
+                                CAST(strftime('%s', {column}) AS INTEGER) * 1000000
+                                + CAST(substr(strftime('%f', {column}), 4) AS INTEGER) * 1000
+                            WHERE typeof({column}) = 'text'
+                        """)
+                    cursor.execute("PRAGMA user_version = 1")
+
+                # Denormalized per-command frequency counts, maintained by
+                # an insert trigger so every write path (direct, queued,
+                # batched) feeds it without repeating upsert logic. Must
+                # run after the timestamp migration above: the backfill
+                # copies MAX(timestamp) into last_used, and a TEXT value
+                # slipping in would sort above every INTEGER one.
+                self._stats_enabled = self._ensure_stats(cursor)
+
+                # Retention: a rolling window keeps suggestion latency
+                # flat over the lifetime of the install. The modulo gate
+                # means the COUNT(*) scan runs on one insert in 256, not
+                # every insert.
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trim_history
+                    AFTER INSERT ON command_history
+                    WHEN (NEW.id % 256 = 0
+                          AND (SELECT COUNT(*) FROM command_history) > {_HISTORY_CAP})
+                    BEGIN
+                        DELETE FROM command_history WHERE id IN (
+                            SELECT id FROM command_history
+                            ORDER BY timestamp ASC LIMIT 1000);
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trim_rejections
+                    AFTER INSERT ON rejected_commands
+                    WHEN (NEW.id % 64 = 0
+                          AND (SELECT COUNT(*) FROM rejected_commands) > {_REJECTION_CAP})
+                    BEGIN
+                        DELETE FROM rejected_commands WHERE id IN (
+                            SELECT id FROM rejected_commands
+                            ORDER BY timestamp ASC LIMIT 500);
+                    END
+                """)
+
+                # Both tables are tiny and hit on every command; mirror
+                # them into the caches wholesale so the alias/preference
+                # fast path never touches the disk again
+                self._warm_caches(cursor)
+
+                # Refresh planner statistics so the composite indexes are
+                # actually chosen for the grouped suggestion queries
+                cursor.execute("ANALYZE")
+
+                self._conn.commit()
+                try:
+                    st = os.stat(self.db_path)
+                    self._db_sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+                except OSError:
+                    self._db_sig = None
         except sqlite3.Error as e:
             # Re-raise with more context for graceful degradation
             raise sqlite3.Error(f"Failed to initialize database at {self.db_path}: {str(e)}") from e
@@ -135,62 +448,200 @@ class HistoryManager:
             # Catch other unexpected errors
             raise RuntimeError(f"Unexpected error initializing database: {str(e)}") from e
 
+    def _warm_caches(self, cursor: sqlite3.Cursor) -> None:
+        """Load all aliases and preferences into the in-memory caches."""
+        self._alias_cache = dict(
+            cursor.execute("SELECT name, command FROM aliases")
+        )
+        self._pref_cache = dict(
+            cursor.execute("SELECT key, value FROM preferences")
+        )
+        self._aliases_complete = True
+
+    def _ensure_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Create the FTS5 mirrors of command_history and rejected_commands.
+
+        External-content tables kept in sync by INSERT/DELETE triggers;
+        when the table is first created against an existing database the
+        index is rebuilt from the content table so old rows are
+        searchable. Returns False when this SQLite build lacks FTS5.
+        """
+        specs = (
+            ("command_history", "command_history_fts"),
+            ("rejected_commands", "rejected_commands_fts"),
+        )
+        try:
+            for table, fts in specs:
+                exists = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)
+                ).fetchone()
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        natural_language,
+                        content='{table}',
+                        content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_fts_ai
+                    AFTER INSERT ON {table} BEGIN
+                        INSERT INTO {fts}(rowid, natural_language)
+                        VALUES (new.id, new.natural_language);
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_fts_ad
+                    AFTER DELETE ON {table} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, natural_language)
+                        VALUES ('delete', old.id, old.natural_language);
+                    END
+                """)
+                if not exists:
+                    cursor.execute(
+                        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+                    )
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _ensure_stats(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Create the shell_command_stats rollup and its maintenance trigger.
+
+        One row per (natural_language, shell_command, working_directory)
+        triple with a running frequency and last-used timestamp, so the
+        suggestion queries aggregate over distinct commands instead of
+        re-counting every execution row. Backfilled from command_history
+        when first created against an existing database. Counts are a
+        lifetime total on purpose: the retention triggers trimming old
+        history rows shouldn't erase what the user runs most.
+
+        Returns False when this SQLite build can't run the upsert inside
+        the trigger body (added in 3.35).
+        """
+        try:
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'shell_command_stats'"
+            ).fetchone()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS shell_command_stats (
+                    natural_language TEXT NOT NULL,
+                    shell_command TEXT NOT NULL,
+                    working_directory TEXT NOT NULL,
+                    frequency INTEGER NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (natural_language, shell_command, working_directory)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_stats_wd
+                ON shell_command_stats(working_directory, shell_command)
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS command_history_stats_ai
+                AFTER INSERT ON command_history BEGIN
+                    INSERT INTO shell_command_stats
+                        (natural_language, shell_command, working_directory,
+                         frequency, last_used)
+                    VALUES (new.natural_language, new.shell_command,
+                            new.working_directory, 1, new.timestamp)
+                    ON CONFLICT(natural_language, shell_command, working_directory)
+                    DO UPDATE SET frequency = frequency + 1,
+                                  last_used = excluded.last_used;
+                END
+            """)
+            if not exists:
+                cursor.execute("""
+                    INSERT INTO shell_command_stats
+                    SELECT natural_language, shell_command, working_directory,
+                           COUNT(*), MAX(timestamp)
+                    FROM command_history
+                    GROUP BY natural_language, shell_command, working_directory
+                """)
+            return True
+        except sqlite3.OperationalError:
+            return False
+
     def add_rejection(self, natural_language: str, shell_command: str) -> None:
         """Record a rejected command interpretation."""
-        timestamp = datetime.now().isoformat()
+        timestamp = _now_us()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO rejected_commands (natural_language, shell_command, timestamp)
-                    VALUES (?, ?, ?)
-                """, (natural_language, shell_command, timestamp))
+            with self._lock, self._checked_conn() as conn:
+                conn.execute(_SQL_INSERT_REJECTION, (natural_language, shell_command, timestamp))
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to record rejection: {e}")
 
     def get_rejections(self, natural_language: str, limit: int = 5) -> List[str]:
         """Retrieve rejected shell commands for similar natural language input."""
+        # Make queued writes visible before reading
+        self.flush()
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT shell_command
-                    FROM rejected_commands
-                    WHERE natural_language LIKE ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                """, (f"%{natural_language}%", limit))
-                return [row[0] for row in cursor.fetchall()]
+            with self._read_lock:
+                cursor = self._checked_reader().cursor()
+                rows = None
+                match = _fts_query(natural_language) if self._fts_enabled else None
+                if match is not None:
+                    try:
+                        cursor.execute("""
+                            SELECT shell_command
+                            FROM rejected_commands
+                            WHERE id IN (SELECT rowid FROM rejected_commands_fts
+                                         WHERE rejected_commands_fts MATCH ?)
+                            ORDER BY timestamp DESC
+                            LIMIT ?
+                        """, (match, limit))
+                        rows = cursor.fetchall()
+                    except sqlite3.OperationalError:
+                        # Query didn't survive tokenization (e.g. all
+                        # punctuation); the LIKE scan still works
+                        rows = None
+                if rows is None:
+                    cursor.execute("""
+                        SELECT shell_command
+                        FROM rejected_commands
+                        WHERE natural_language LIKE ?
+                        ORDER BY timestamp DESC
+                        LIMIT ?
+                    """, (f"%{natural_language}%", limit))
+                    rows = cursor.fetchall()
+                return [row[0] for row in rows]
         except sqlite3.Error:
             return []
     
     def clear_rejections(self, natural_language: str) -> None:
         """Clear rejected commands for a specific natural language input after success."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    DELETE FROM rejected_commands
-                    WHERE natural_language = ?
-                """, (natural_language,))
+            with self._lock, self._checked_conn() as conn:
+                conn.execute(_SQL_DELETE_REJECTIONS, (natural_language,))
         except sqlite3.Error:
             pass  # Fail silently
 
     def set_preference(self, key: str, value: str) -> None:
         """Set a user preference."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._checked_conn() as conn:
                 conn.execute(
                     "INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)",
                     (key, value)
                 )
+            self._pref_cache[key] = value
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to set preference: {e}")
 
     def get_preference(self, key: str, default: Optional[str] = None) -> Optional[str]:
-        """Get a user preference."""
+        """Get a user preference; repeat lookups come from the cache."""
+        if key in self._pref_cache:
+            value = self._pref_cache[key]
+            return value if value is not None else default
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT value FROM preferences WHERE key = ?", (key,))
+            with self._read_lock:
+                cursor = self._checked_reader().execute(
+                    "SELECT value FROM preferences WHERE key = ?", (key,))
                 row = cursor.fetchone()
+                self._pref_cache[key] = row[0] if row else None
                 return row[0] if row else default
         except sqlite3.Error:
             return default
@@ -228,20 +679,14 @@ class HistoryManager:
         if working_directory is None:
             working_directory = os.getcwd()
         
-        timestamp = datetime.now().isoformat()
+        timestamp = _now_us()
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            try:
+            with self._lock:
+                conn = self._checked_conn()
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO command_history 
-                    (natural_language, shell_command, working_directory, exit_code, timestamp, execution_time)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (natural_language, shell_command, working_directory, exit_code, timestamp, execution_time))
+                cursor.execute(_SQL_INSERT_HISTORY, (natural_language, shell_command, working_directory, exit_code, timestamp, execution_time))
                 conn.commit()
-            finally:
-                conn.close()
         except sqlite3.Error as e:
             # Re-raise with context for graceful degradation
             raise sqlite3.Error(f"Failed to save command to history: {str(e)}") from e
@@ -249,6 +694,266 @@ class HistoryManager:
             # Catch other unexpected errors
             raise RuntimeError(f"Unexpected error saving command: {str(e)}") from e
     
+    def record_success(
+        self,
+        natural_language: str,
+        shell_command: str,
+        exit_code: int,
+        execution_time: float,
+        working_directory: Optional[str] = None
+    ) -> None:
+        """
+        Persist a successful command and clear its rejections in one transaction.
+
+        The REPL does both after every successful execution; batching them
+        onto a single connection means one commit (and one fsync) per turn
+        instead of two.
+
+        Args:
+            natural_language: The original natural language input
+            shell_command: The interpreted shell command
+            exit_code: The command's exit code
+            execution_time: Time taken to execute the command in seconds
+            working_directory: Directory where command was executed. If None, uses current directory.
+
+        Raises:
+            sqlite3.Error: If database operation fails
+            ValueError: If required parameters are invalid
+        """
+        # Validate inputs
+        if not natural_language or not natural_language.strip():
+            raise ValueError("natural_language cannot be empty")
+        if not shell_command or not shell_command.strip():
+            raise ValueError("shell_command cannot be empty")
+        if execution_time < 0:
+            raise ValueError("execution_time cannot be negative")
+
+        if working_directory is None:
+            working_directory = os.getcwd()
+
+        timestamp = _now_us()
+
+        try:
+            with self._lock:
+                conn = self._checked_conn()
+                cursor = conn.cursor()
+                cursor.execute(_SQL_DELETE_REJECTIONS, (natural_language,))
+                cursor.execute(_SQL_INSERT_HISTORY, (natural_language, shell_command, working_directory, exit_code, timestamp, execution_time))
+                conn.commit()
+        except sqlite3.Error as e:
+            # Re-raise with context for graceful degradation
+            raise sqlite3.Error(f"Failed to save command to history: {str(e)}") from e
+        except Exception as e:
+            # Catch other unexpected errors
+            raise RuntimeError(f"Unexpected error saving command: {str(e)}") from e
+
+    def queue_success(
+        self,
+        natural_language: str,
+        shell_command: str,
+        exit_code: int,
+        execution_time: float,
+        working_directory: Optional[str] = None
+    ) -> None:
+        """
+        Queue a successful command for deferred persistence.
+
+        The row (and its rejection cleanup) is written by the next flush(),
+        moving the commit off the post-execution path. Validation happens
+        here so bad input fails at the call site, not at flush time.
+
+        Raises:
+            ValueError: If required parameters are invalid
+        """
+        if not natural_language or not natural_language.strip():
+            raise ValueError("natural_language cannot be empty")
+        if not shell_command or not shell_command.strip():
+            raise ValueError("shell_command cannot be empty")
+        if execution_time < 0:
+            raise ValueError("execution_time cannot be negative")
+
+        if working_directory is None:
+            working_directory = os.getcwd()
+
+        self._pending_writes.append((
+            "success",
+            (natural_language, shell_command, working_directory,
+             exit_code, _now_us(), execution_time)
+        ))
+        self._notify_writer()
+
+    def queue_rejection(self, natural_language: str, shell_command: str) -> None:
+        """Queue a rejected interpretation for deferred persistence."""
+        self._pending_writes.append((
+            "rejection",
+            (natural_language, shell_command, _now_us())
+        ))
+        self._notify_writer()
+
+    def _notify_writer(self) -> None:
+        """Wake the background writer, starting it on first use."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_worker, daemon=True)
+            self._writer.start()
+        self._write_event.set()
+
+    def _write_worker(self) -> None:
+        """
+        Drain queued writes in the background.
+
+        flush() serializes on the shared connection's lock, so the worker
+        and the REPL thread never collide. The short sleep after each
+        wake-up lets bursts of writes coalesce into one transaction.
+        Interactive reads still call
+        flush() directly, which is safe: whichever side drains first wins
+        and the other finds the queue empty.
+        """
+        while True:
+            self._write_event.wait()
+            self._write_event.clear()
+            time.sleep(0.05)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The queue was already drained into the failed transaction;
+                # surfacing errors here would land on no caller. The next
+                # foreground flush/read reports problems normally.
+                pass
+
+    def flush(self) -> None:
+        """
+        Write all queued operations in a single transaction.
+
+        Read paths call this first so queued rows are always visible; the
+        REPL also flushes at shutdown. One commit covers however many turns
+        accumulated since the last read.
+
+        Raises:
+            sqlite3.Error: If database operation fails
+        """
+        if not self._pending_writes:
+            return
+
+        # Drain via popleft's own atomicity: the worker thread and a
+        # foreground read can flush concurrently, so checking emptiness
+        # before popping would race — whoever loses the pop just stops
+        ops = []
+        while True:
+            try:
+                ops.append(self._pending_writes.popleft())
+            except IndexError:
+                break
+        if not ops:
+            return
+
+        try:
+            with self._lock:
+                conn = self._checked_conn()
+                cursor = conn.cursor()
+                for op, payload in ops:
+                    if op == "success":
+                        cursor.execute(_SQL_DELETE_REJECTIONS, (payload[0],))
+                        cursor.execute(_SQL_INSERT_HISTORY, payload)
+                    elif op == "rejection":
+                        cursor.execute(_SQL_INSERT_REJECTION, payload)
+                conn.commit()
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Failed to flush queued history writes: {str(e)}") from e
+
+    def save_commands_bulk(self, entries: List[tuple]) -> None:
+        """
+        Insert many history rows under a single commit.
+
+        Each entry is (natural_language, shell_command, working_directory,
+        exit_code, timestamp, execution_time) — the column order of
+        command_history. One fsync covers the whole list instead of one
+        per row.
+
+        Raises:
+            sqlite3.Error: If database operation fails
+        """
+        self._write_batch(entries, [])
+
+    def add_rejections_bulk(self, entries: List[tuple]) -> None:
+        """
+        Insert many rejection rows under a single commit.
+
+        Each entry is (natural_language, shell_command, timestamp).
+
+        Raises:
+            sqlite3.Error: If database operation fails
+        """
+        self._write_batch([], entries)
+
+    def batch(self) -> "HistoryBatch":
+        """
+        Collect several writes and commit them together.
+
+        Usage::
+
+            with history.batch() as b:
+                b.save_command("list files", "ls", 0, 0.1)
+                b.add_rejection("list files", "rm -rf /")
+
+        Nothing touches the database until the block exits; the flush is
+        one transaction, so a turn's worth of bookkeeping costs one
+        commit. On an exception inside the block the queued writes are
+        discarded.
+        """
+        return HistoryBatch(self)
+
+    def _write_batch(self, commands: List[tuple], rejections: List[tuple]) -> None:
+        """Write both row kinds in one executemany-backed transaction."""
+        if not commands and not rejections:
+            return
+        try:
+            with self._lock:
+                conn = self._checked_conn()
+                cursor = conn.cursor()
+                if commands:
+                    cursor.executemany(_SQL_INSERT_HISTORY, commands)
+                if rejections:
+                    cursor.executemany(_SQL_INSERT_REJECTION, rejections)
+                conn.commit()
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Failed to write history batch: {str(e)}") from e
+
+    def prune(self, keep: int = _HISTORY_CAP) -> int:
+        """
+        Trim command_history to its newest ``keep`` rows right now.
+
+        The insert triggers keep the tables bounded in the steady state;
+        this is the manual knob for shrinking an oversized database in
+        one go. Rejections are trimmed to a tenth of ``keep``.
+
+        Returns:
+            Number of history rows deleted.
+
+        Raises:
+            sqlite3.Error: If database operation fails
+        """
+        if keep < 0:
+            raise ValueError("keep cannot be negative")
+        try:
+            with self._lock:
+                conn = self._checked_conn()
+                cursor = conn.cursor()
+                cursor.execute("""
+                    DELETE FROM command_history WHERE id IN (
+                        SELECT id FROM command_history
+                        ORDER BY timestamp DESC LIMIT -1 OFFSET ?)
+                """, (keep,))
+                deleted = cursor.rowcount
+                cursor.execute("""
+                    DELETE FROM rejected_commands WHERE id IN (
+                        SELECT id FROM rejected_commands
+                        ORDER BY timestamp DESC LIMIT -1 OFFSET ?)
+                """, (max(1, keep // 10),))
+                conn.commit()
+                return deleted
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Failed to prune history: {str(e)}") from e
+
     def get_suggestions(self, natural_language: str, limit: int = 5) -> List[HistoryEntry]:
         """
         Retrieve similar past commands based on natural language input.
@@ -267,51 +972,68 @@ class HistoryManager:
             sqlite3.Error: If database query fails
             ValueError: If parameters are invalid
         """
+        # Make queued writes visible before reading
+        self.flush()
+
         if not natural_language or not natural_language.strip():
             raise ValueError("natural_language cannot be empty")
         if limit <= 0:
             raise ValueError("limit must be positive")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                cursor = conn.cursor()
-                
-                # Search for commands with similar natural language using LIKE
+            with self._read_lock:
+                cursor = self._checked_reader().cursor()
+                cursor.row_factory = _history_row_factory
+
+                # Search for commands with similar natural language; the
+                # FTS5 index narrows to matching rows without a full scan,
+                # with the original LIKE query as fallback.
                 # Order by frequency (count) and recency (max timestamp)
-                cursor.execute("""
-                    SELECT 
-                        id,
-                        natural_language,
-                        shell_command,
-                        working_directory,
-                        exit_code,
-                        timestamp,
-                        execution_time,
-                        COUNT(*) as frequency,
-                        MAX(timestamp) as last_used
-                    FROM command_history
-                    WHERE natural_language LIKE ?
-                    GROUP BY shell_command
-                    ORDER BY frequency DESC, last_used DESC
-                    LIMIT ?
-                """, (f"%{natural_language}%", limit))
-                
-                rows = cursor.fetchall()
-                return [
-                    HistoryEntry(
-                        id=row[0],
-                        natural_language=row[1],
-                        shell_command=row[2],
-                        working_directory=row[3],
-                        exit_code=row[4],
-                        timestamp=datetime.fromisoformat(row[5]),
-                        execution_time=row[6]
-                    )
-                    for row in rows
-                ]
-            finally:
-                conn.close()
+                rows = None
+                match = _fts_query(natural_language) if self._fts_enabled else None
+                if match is not None:
+                    try:
+                        cursor.execute("""
+                            SELECT
+                                id,
+                                natural_language,
+                                shell_command,
+                                working_directory,
+                                exit_code,
+                                timestamp,
+                                execution_time,
+                                COUNT(*) as frequency,
+                                MAX(timestamp) as last_used
+                            FROM command_history
+                            WHERE id IN (SELECT rowid FROM command_history_fts
+                                         WHERE command_history_fts MATCH ?)
+                            GROUP BY shell_command
+                            ORDER BY frequency DESC, last_used DESC
+                            LIMIT ?
+                        """, (match, limit))
+                        rows = cursor.fetchall()
+                    except sqlite3.OperationalError:
+                        rows = None
+                if rows is None:
+                    cursor.execute("""
+                        SELECT
+                            id,
+                            natural_language,
+                            shell_command,
+                            working_directory,
+                            exit_code,
+                            timestamp,
+                            execution_time,
+                            COUNT(*) as frequency,
+                            MAX(timestamp) as last_used
+                        FROM command_history
+                        WHERE natural_language LIKE ?
+                        GROUP BY shell_command
+                        ORDER BY frequency DESC, last_used DESC
+                        LIMIT ?
+                    """, (f"%{natural_language}%", limit))
+                    rows = cursor.fetchall()
+                return rows
         except sqlite3.Error as e:
             # Re-raise with context
             raise sqlite3.Error(f"Failed to retrieve suggestions: {str(e)}") from e
@@ -319,6 +1041,134 @@ class HistoryManager:
             # Catch other unexpected errors
             raise RuntimeError(f"Unexpected error retrieving suggestions: {str(e)}") from e
     
+    def prefetch_turn(self, natural_language: str, limit: int = 3) -> TurnContext:
+        """
+        Fetch the per-turn suggestion and rejection reads on one connection.
+
+        The REPL needs both before every interpretation; running them in a
+        single connection halves the open/close overhead and keeps the
+        SQLite page cache warm between the two SELECTs.
+
+        Args:
+            natural_language: The natural language input to match against
+            limit: Maximum number of rows per query
+
+        Returns:
+            TurnContext with matching HistoryEntry suggestions and
+            rejected shell command strings
+
+        Raises:
+            sqlite3.Error: If the database query fails
+            ValueError: If parameters are invalid
+        """
+        # Make queued writes visible before reading
+        self.flush()
+
+        if not natural_language or not natural_language.strip():
+            raise ValueError("natural_language cannot be empty")
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+
+        pattern = f"%{natural_language}%"
+
+        try:
+            with self._read_lock:
+                cursor = self._checked_reader().cursor()
+                # Both per-turn reads in one planned statement; rows are
+                # flagged by source so the split back out is a single pass.
+                # The FTS5 variant swaps each LIKE scan for an index probe.
+                rows = None
+                match = _fts_query(natural_language) if self._fts_enabled else None
+                if match is not None:
+                    try:
+                        cursor.execute("""
+                            SELECT * FROM (
+                                SELECT
+                                    'h' AS src,
+                                    id,
+                                    natural_language,
+                                    shell_command,
+                                    working_directory,
+                                    exit_code,
+                                    timestamp,
+                                    execution_time,
+                                    COUNT(*) as frequency,
+                                    MAX(timestamp) as last_used
+                                FROM command_history
+                                WHERE id IN (SELECT rowid FROM command_history_fts
+                                             WHERE command_history_fts MATCH ?)
+                                GROUP BY shell_command
+                                ORDER BY frequency DESC, last_used DESC
+                                LIMIT ?
+                            )
+                            UNION ALL
+                            SELECT * FROM (
+                                SELECT
+                                    'r', NULL, NULL, shell_command,
+                                    NULL, NULL, timestamp, NULL, 0, NULL
+                                FROM rejected_commands
+                                WHERE id IN (SELECT rowid FROM rejected_commands_fts
+                                             WHERE rejected_commands_fts MATCH ?)
+                                ORDER BY timestamp DESC
+                                LIMIT ?
+                            )
+                        """, (match, limit, match, limit))
+                        rows = cursor.fetchall()
+                    except sqlite3.OperationalError:
+                        rows = None
+                if rows is None:
+                    cursor.execute("""
+                        SELECT * FROM (
+                            SELECT
+                                'h' AS src,
+                                id,
+                                natural_language,
+                                shell_command,
+                                working_directory,
+                                exit_code,
+                                timestamp,
+                                execution_time,
+                                COUNT(*) as frequency,
+                                MAX(timestamp) as last_used
+                            FROM command_history
+                            WHERE natural_language LIKE ?
+                            GROUP BY shell_command
+                            ORDER BY frequency DESC, last_used DESC
+                            LIMIT ?
+                        )
+                        UNION ALL
+                        SELECT * FROM (
+                            SELECT
+                                'r', NULL, NULL, shell_command,
+                                NULL, NULL, timestamp, NULL, 0, NULL
+                            FROM rejected_commands
+                            WHERE natural_language LIKE ?
+                            ORDER BY timestamp DESC
+                            LIMIT ?
+                        )
+                    """, (pattern, limit, pattern, limit))
+                    rows = cursor.fetchall()
+
+                suggestions = []
+                rejections = []
+                for row in rows:
+                    if row[0] == 'h':
+                        suggestions.append(HistoryEntry(
+                            id=row[1],
+                            natural_language=row[2],
+                            shell_command=row[3],
+                            working_directory=row[4],
+                            exit_code=row[5],
+                            timestamp=_ts_to_dt(row[6]),
+                            execution_time=row[7]
+                        ))
+                    else:
+                        rejections.append(row[3])
+
+                return TurnContext(suggestions=suggestions, rejections=rejections)
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Failed to prefetch turn context: {str(e)}") from e
+
     def get_recent_commands(self, limit: int = 10) -> List[HistoryEntry]:
         """
         Retrieve the most recent commands from history.
@@ -333,13 +1183,16 @@ class HistoryManager:
             sqlite3.Error: If database query fails
             ValueError: If limit is invalid
         """
+        # Make queued writes visible before reading
+        self.flush()
+
         if limit <= 0:
             raise ValueError("limit must be positive")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                cursor = conn.cursor()
+            with self._read_lock:
+                cursor = self._checked_reader().cursor()
+                cursor.row_factory = _history_row_factory
                 cursor.execute("""
                     SELECT 
                         id,
@@ -353,22 +1206,8 @@ class HistoryManager:
                     ORDER BY timestamp DESC
                     LIMIT ?
                 """, (limit,))
-                
-                rows = cursor.fetchall()
-                return [
-                    HistoryEntry(
-                        id=row[0],
-                        natural_language=row[1],
-                        shell_command=row[2],
-                        working_directory=row[3],
-                        exit_code=row[4],
-                        timestamp=datetime.fromisoformat(row[5]),
-                        execution_time=row[6]
-                    )
-                    for row in rows
-                ]
-            finally:
-                conn.close()
+
+                return cursor.fetchall()
         except sqlite3.Error as e:
             # Re-raise with context
             raise sqlite3.Error(f"Failed to retrieve recent commands: {str(e)}") from e
@@ -380,43 +1219,71 @@ class HistoryManager:
         """
         Retrieve frequent commands executed in the specified directory.
         """
+        # Make queued writes visible before reading
+        self.flush()
+
         if limit <= 0:
             raise ValueError("limit must be positive")
             
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        id,
-                        natural_language,
-                        shell_command,
-                        working_directory,
-                        exit_code,
-                        timestamp,
-                        execution_time,
-                        COUNT(*) as frequency,
-                        MAX(timestamp) as last_used
-                    FROM command_history
-                    WHERE working_directory = ?
-                    GROUP BY shell_command
-                    ORDER BY frequency DESC, last_used DESC
-                    LIMIT ?
-                """, (directory, limit))
-                
-                rows = cursor.fetchall()
-                return [
-                    HistoryEntry(
-                        id=row[0],
-                        natural_language=row[1],
-                        shell_command=row[2],
-                        working_directory=row[3],
-                        exit_code=row[4],
-                        timestamp=datetime.fromisoformat(row[5]),
-                        execution_time=row[6]
-                    )
-                    for row in rows
-                ]
+            with self._read_lock:
+                cursor = self._checked_reader().cursor()
+                cursor.row_factory = _history_row_factory
+                if self._stats_enabled:
+                    # Rank from the rollup (one row per distinct command in
+                    # the directory, pre-counted), then fetch each winner's
+                    # most recent history row for the entry columns — the
+                    # same row the old MAX(timestamp) grouping surfaced.
+                    # Both the rank scan and the correlated lookup are
+                    # index range scans; no COUNT over execution rows.
+                    cursor.execute("""
+                        SELECT
+                            h.id,
+                            h.natural_language,
+                            h.shell_command,
+                            h.working_directory,
+                            h.exit_code,
+                            h.timestamp,
+                            h.execution_time
+                        FROM (
+                            SELECT shell_command,
+                                   SUM(frequency) AS frequency,
+                                   MAX(last_used) AS last_used
+                            FROM shell_command_stats
+                            WHERE working_directory = ?1
+                            GROUP BY shell_command
+                            ORDER BY frequency DESC, last_used DESC
+                            LIMIT ?2
+                        ) s
+                        JOIN command_history h ON h.id = (
+                            SELECT id FROM command_history
+                            WHERE working_directory = ?1
+                              AND shell_command = s.shell_command
+                            ORDER BY timestamp DESC
+                            LIMIT 1
+                        )
+                        ORDER BY s.frequency DESC, s.last_used DESC
+                    """, (directory, limit))
+                else:
+                    cursor.execute("""
+                        SELECT
+                            id,
+                            natural_language,
+                            shell_command,
+                            working_directory,
+                            exit_code,
+                            timestamp,
+                            execution_time,
+                            COUNT(*) as frequency,
+                            MAX(timestamp) as last_used
+                        FROM command_history
+                        WHERE working_directory = ?
+                        GROUP BY shell_command
+                        ORDER BY frequency DESC, last_used DESC
+                        LIMIT ?
+                    """, (directory, limit))
+
+                return cursor.fetchall()
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to retrieve directory suggestions: {e}")
 
@@ -425,40 +1292,122 @@ class HistoryManager:
         if not name or not command:
             raise ValueError("Name and command are required")
             
-        timestamp = datetime.now().isoformat()
+        timestamp = _now_us()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._checked_conn() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO aliases (name, command, created_at)
                     VALUES (?, ?, ?)
                 """, (name, command, timestamp))
+            self._alias_cache[name] = command
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Failed to save alias: {e}")
 
     def get_alias(self, name: str) -> Optional[str]:
-        """Get command for an alias."""
+        """Get command for an alias; repeat lookups come from the cache."""
+        if name in self._alias_cache:
+            return self._alias_cache[name]
+        # The warmed cache mirrors the whole table, so an absent key is a
+        # definitive miss — and every REPL turn probes arbitrary user
+        # input here, so caching each miss would grow without bound
+        if self._aliases_complete:
+            return None
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT command FROM aliases WHERE name = ?", (name,))
+            with self._read_lock:
+                cursor = self._checked_reader().execute(
+                    "SELECT command FROM aliases WHERE name = ?", (name,))
                 row = cursor.fetchone()
-                return row[0] if row else None
+                self._alias_cache[name] = row[0] if row else None
+                return self._alias_cache[name]
         except sqlite3.Error:
             return None
 
     def remove_alias(self, name: str) -> bool:
         """Remove an alias. Returns True if removed, False if not found."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._checked_conn() as conn:
                 cursor = conn.execute("DELETE FROM aliases WHERE name = ?", (name,))
+                self._alias_cache[name] = None
                 return cursor.rowcount > 0
         except sqlite3.Error:
             return False
 
+    def reload(self) -> None:
+        """Rebuild the preference/alias caches, e.g. after external edits."""
+        self._pref_cache.clear()
+        self._alias_cache.clear()
+        self._aliases_complete = False
+        try:
+            with self._lock:
+                self._warm_caches(self._checked_conn().cursor())
+        except sqlite3.Error:
+            # Caches stay empty; lookups fall back to the database
+            pass
+
     def list_aliases(self) -> List[tuple[str, str]]:
         """List all aliases. Returns list of (name, command) tuples."""
+        if self._aliases_complete:
+            # The cache mirrors the whole table; None marks removals
+            return sorted(
+                (name, command)
+                for name, command in self._alias_cache.items()
+                if command is not None
+            )
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT name, command FROM aliases ORDER BY name")
+            with self._read_lock:
+                cursor = self._checked_reader().execute(
+                    "SELECT name, command FROM aliases ORDER BY name")
                 return cursor.fetchall()
         except sqlite3.Error:
             return []
+
+class HistoryBatch:
+    """
+    Write buffer returned by HistoryManager.batch().
+
+    Queues rows in memory and hands them to the manager's single-commit
+    batch writer when the context exits cleanly. Validation mirrors
+    queue_success so bad input fails at the call site, not at flush.
+    """
+
+    def __init__(self, manager: HistoryManager):
+        self._manager = manager
+        self._commands: List[tuple] = []
+        self._rejections: List[tuple] = []
+
+    def save_command(
+        self,
+        natural_language: str,
+        shell_command: str,
+        exit_code: int,
+        execution_time: float,
+        working_directory: Optional[str] = None
+    ) -> None:
+        """Queue a history row for the batch commit."""
+        if not natural_language or not natural_language.strip():
+            raise ValueError("natural_language cannot be empty")
+        if not shell_command or not shell_command.strip():
+            raise ValueError("shell_command cannot be empty")
+        if execution_time < 0:
+            raise ValueError("execution_time cannot be negative")
+        if working_directory is None:
+            working_directory = os.getcwd()
+        self._commands.append((
+            natural_language, shell_command, working_directory,
+            exit_code, _now_us(), execution_time
+        ))
+
+    def add_rejection(self, natural_language: str, shell_command: str) -> None:
+        """Queue a rejection row for the batch commit."""
+        self._rejections.append((
+            natural_language, shell_command, _now_us()
+        ))
+
+    def __enter__(self) -> "HistoryBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self._manager._write_batch(self._commands, self._rejections)
+        self._commands = []
+        self._rejections = []
@@ -3,13 +3,25 @@ Knowledge base manager for custom commands, paths, and examples.
 """
 
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class KnowledgeBase:
     """Manages user-defined commands, paths, and examples."""
-    
+
+    # Parsed entries cached per file, keyed on (st_mtime_ns, st_size) so the
+    # file is only re-read when it actually changes on disk. The lowered
+    # natural-language keys and the word -> entry-index inverted index are
+    # precomputed here so searches never re-lower or re-split.
+    _cache: Dict[Path, Tuple[int, int, List[tuple], List[str], Dict[str, List[int]]]] = {}
+
+    # Memoized search results, keyed on (file key, query, limit). Bounded so
+    # long REPL sessions with many distinct queries don't grow unchecked.
+    _search_cache: Dict[tuple, List[tuple]] = {}
+    _search_cache_size = 256
+
     def __init__(self, knowledge_file: Optional[str] = None):
         """
         Initialize knowledge base.
@@ -65,9 +77,19 @@ go to desktop -> cd ~/Desktop
         Returns:
             List of (natural_language, shell_command) tuples
         """
-        if not self.knowledge_file.exists():
+        try:
+            stat = os.stat(self.knowledge_file)
+        except OSError:
+            # Evict any stale entry so later lookups don't serve a copy of
+            # a file that no longer exists
+            self._cache.pop(self.knowledge_file, None)
             return []
-        
+
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(self.knowledge_file)
+        if cached is not None and cached[:2] == file_key:
+            return cached[2]
+
         knowledge = []
         try:
             content = self.knowledge_file.read_text()
@@ -85,13 +107,37 @@ go to desktop -> cd ~/Desktop
                         natural = parts[0].strip()
                         command = parts[1].strip()
                         if natural and command:
-                            knowledge.append((natural, command))
+                            # Interned: entries are cached for the session
+                            # and re-hashed by the search memoization
+                            knowledge.append((sys.intern(natural), sys.intern(command)))
         except Exception:
             # If file is corrupted, return empty list
+            self._cache.pop(self.knowledge_file, None)
             return []
-        
+
+        lowered = [natural.lower() for natural, _ in knowledge]
+        # Inverted index: word -> indexes of entries containing it, built
+        # once per file version so searches can confirm exact-word hits
+        # without re-running the substring checks on those entries
+        word_index: Dict[str, List[int]] = {}
+        for idx, natural_lower in enumerate(lowered):
+            for word in set(natural_lower.split()):
+                word_index.setdefault(word, []).append(idx)
+        self._cache[self.knowledge_file] = (
+            file_key[0], file_key[1], knowledge, lowered, word_index
+        )
         return knowledge
-    
+
+    def _load_cached(self) -> Optional[tuple]:
+        """
+        Load (refreshing if stale) and return the full cache entry.
+
+        One dict probe serves both the entries and their lowered copies,
+        instead of load_knowledge() plus a second _cache lookup.
+        """
+        self.load_knowledge()
+        return self._cache.get(self.knowledge_file)
+
     def search_knowledge(self, query: str, limit: int = 3) -> List[tuple[str, str]]:
         """
         Search knowledge base for relevant entries.
@@ -103,22 +149,49 @@ go to desktop -> cd ~/Desktop
         Returns:
             List of (natural_language, shell_command) tuples
         """
-        knowledge = self.load_knowledge()
+        cached = self._load_cached()
+        knowledge = cached[2] if cached is not None else []
+        file_key = cached[:2] if cached is not None else None
+        search_key = (self.knowledge_file, file_key, query, limit)
+        hit = self._search_cache.get(search_key)
+        if hit is not None:
+            return hit
+
         query_lower = query.lower()
-        
+        query_words = query_lower.split()
+        lowered = cached[3] if cached is not None else [n.lower() for n, _ in knowledge]
+
+        # Exact query words hit the inverted index; those entries match by
+        # definition (an exact word is also a substring), so the scan can
+        # skip their string work. The index alone can't answer the query —
+        # the scan also matches words as fragments of entry words ('git'
+        # in 'github pages deploy') — so every entry is still visited, but
+        # the loop stops as soon as the limit is filled, which is all the
+        # old full-scan-then-slice ever kept.
+        candidates: frozenset = frozenset()
+        if cached is not None and query_words:
+            word_index = cached[4]
+            candidates = frozenset(
+                i for word in query_words for i in word_index.get(word, ())
+            )
+
         # Find entries where the natural language contains query words
         matches = []
-        for natural, command in knowledge:
-            natural_lower = natural.lower()
-            
-            # Check if query is substring of natural language
-            if query_lower in natural_lower:
+        for idx, ((natural, command), natural_lower) in enumerate(zip(knowledge, lowered)):
+            # Check if query is substring of natural language,
+            # or if any word in query matches
+            if (idx in candidates
+                    or query_lower in natural_lower
+                    or any(word in natural_lower for word in query_words)):
                 matches.append((natural, command))
-            # Or check if any word in query matches
-            elif any(word in natural_lower for word in query_lower.split()):
-                matches.append((natural, command))
-        
-        return matches[:limit]
+                if len(matches) >= limit:
+                    break
+
+        result = matches
+        if len(self._search_cache) >= self._search_cache_size:
+            self._search_cache.clear()
+        self._search_cache[search_key] = result
+        return result
     
     def add_entry(self, natural_language: str, shell_command: str):
         """
@@ -128,12 +201,28 @@ go to desktop -> cd ~/Desktop
             natural_language: Natural language description
             shell_command: Shell command
         """
-        if not natural_language or not shell_command:
+        self.add_entries([(natural_language, shell_command)])
+
+    def add_entries(self, entries) -> None:
+        """
+        Append many entries with one open/write instead of one per entry.
+
+        Args:
+            entries: Iterable of (natural_language, shell_command) pairs;
+                pairs with an empty half are skipped, matching add_entry.
+        """
+        lines = [
+            f"\n{natural} -> {command}\n"
+            for natural, command in entries
+            if natural and command
+        ]
+        if not lines:
             return
-        
-        # Append to file
+
+        # One syscall (and at most one fsync on strict filesystems) for
+        # the whole batch; the mtime bump invalidates the parse cache
         with open(self.knowledge_file, 'a') as f:
-            f.write(f"\n{natural_language} -> {shell_command}\n")
+            f.write(''.join(lines))
     
     def get_knowledge_file_path(self) -> str:
         """Get the path to the knowledge file."""
@@ -2,133 +2,48 @@
 Ollama client for natural language to shell command interpretation.
 """
 
+import json
+
 import requests
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass
 
 
-@dataclass
-class OllamaConfig:
-    """Configuration for Ollama client."""
-    endpoint: str = "http://localhost:11434"
-    model: str = "llama3.2"
-    timeout: int = 10
-
-
-class OllamaConnectionError(Exception):
-    """Raised when connection to Ollama fails."""
-    pass
+# Static prompt text is built once at import time. build_prompt places it
+# (plus the rarely-changing blacklist) at the front of every prompt so the
+# Ollama server can reuse its cached prefix evaluation across turns instead
+# of re-evaluating the same tokens on every request.
+_SYSTEM_PROMPT = """You are a shell command interpreter. Convert natural language descriptions into shell commands.
 
+Rules:
+- Return ONLY the shell command, nothing else
+- No explanations, no markdown, no code blocks
+- Use standard bash/zsh syntax for macOS
+- Be precise and safe
+- If the request is unclear, return the closest safe interpretation
+- Use the file list in the Context to correct file name casing (e.g., if User asks for 'readme.md' but Context shows 'README.md', use 'README.md')
+- For find/grep commands that may hit permission errors, add '2>/dev/null' to suppress error messages
+- When searching home directory or system paths, always suppress stderr with '2>/dev/null'
+- Prefer safe, non-destructive operations when ambiguous
+- Use proper quoting for filenames with spaces or special characters
+- On macOS, use 'open' command to launch applications: 'open -a "App Name"'
+- On macOS, use 'open' command to open files with default application: 'open filename'
+- On macOS, use 'open .' to open current directory in Finder
+- For complex operations, use pipes and command chaining appropriately
 
-class OllamaInterpretationError(Exception):
-    """Raised when Ollama cannot interpret the command."""
-    pass
-
+IMPORTANT - Time-based file searches:
+- Use -mtime with a SINGLE number, not a range
+- -mtime -7 means "modified in the last 7 days" (less than 7 days ago)
+- -mtime +7 means "modified more than 7 days ago"
+- -mtime 7 means "modified exactly 7 days ago"
+- NEVER use syntax like -mtime 7-14 (this is INVALID)
+- When combining -name and -mtime, use AND (implicit), NEVER use -o (OR)
+- CORRECT: find . -name "*.py" -mtime -7 (python files modified in last 7 days)
+- WRONG: find with -o between -name and -mtime (this finds ALL python files OR all recent files)
+"""
 
-class OllamaClient:
-    """Client for interacting with local Ollama service."""
-    
-    def __init__(self, config: Optional[OllamaConfig] = None):
-        """
-        Initialize Ollama client.
-        
-        Args:
-            config: Optional configuration. Uses defaults if not provided.
-        """
-        self.config = config or OllamaConfig()
-    
-    def check_connection(self) -> bool:
-        """
-        Verify that Ollama service is running and accessible.
-        
-        Returns:
-            True if Ollama is available, False otherwise.
-        
-        Raises:
-            OllamaConnectionError: If connection check fails with details.
-        """
-        try:
-            response = requests.get(
-                f"{self.config.endpoint}/api/tags",
-                timeout=self.config.timeout
-            )
-            response.raise_for_status()
-            return True
-        except requests.exceptions.ConnectionError as e:
-            raise OllamaConnectionError(
-                f"Cannot connect to Ollama at {self.config.endpoint}. "
-                "Is Ollama running? Try: 'ollama serve'"
-            ) from e
-        except requests.exceptions.Timeout as e:
-            raise OllamaConnectionError(
-                f"Connection to Ollama timed out after {self.config.timeout} seconds."
-            ) from e
-        except requests.exceptions.RequestException as e:
-            raise OllamaConnectionError(
-                f"Error connecting to Ollama: {str(e)}"
-            ) from e
-    
-    def _categorize_domain(self, user_input: str) -> list[str]:
-        """
-        Categorize user input into command domains.
-        
-        Args:
-            user_input: Natural language input from user.
-        
-        Returns:
-            List of detected domain categories (file, process, network, text).
-        """
-        input_lower = user_input.lower()
-        domains = []
-        
-        # File operation keywords
-        file_keywords = [
-            'find', 'search', 'locate', 'list', 'ls', 'copy', 'cp', 'move', 'mv',
-            'rename', 'delete', 'remove', 'file', 'files', 'directory', 'folder',
-            'path', 'tree', 'disk', 'space', 'size', 'du', 'df'
-        ]
-        if any(keyword in input_lower for keyword in file_keywords):
-            domains.append('file')
-        
-        # Process management keywords
-        process_keywords = [
-            'process', 'kill', 'stop', 'terminate', 'ps', 'top', 'running',
-            'background', 'foreground', 'job', 'jobs', 'bg', 'fg', 'cpu', 'memory',
-            'ram', 'performance', 'monitor'
-        ]
-        if any(keyword in input_lower for keyword in process_keywords):
-            domains.append('process')
-        
-        # Network operation keywords
-        network_keywords = [
-            'download', 'upload', 'curl', 'wget', 'fetch', 'http', 'https',
-            'ping', 'network', 'connection', 'port', 'netstat', 'ip', 'dns',
-            'url', 'api', 'request'
-        ]
-        if any(keyword in input_lower for keyword in network_keywords):
-            domains.append('network')
-        
-        # Text processing keywords
-        text_keywords = [
-            'grep', 'search', 'filter', 'sed', 'awk', 'replace', 'substitute',
-            'cut', 'sort', 'uniq', 'unique', 'count', 'wc', 'lines', 'words',
-            'pattern', 'match', 'pipe', 'extract'
-        ]
-        if any(keyword in input_lower for keyword in text_keywords):
-            domains.append('text')
-        
-        return domains
-    
-    def _get_comprehensive_examples(self) -> str:
-        """
-        Get comprehensive examples covering the 50 most common commands.
-        
-        Returns:
-            String containing comprehensive command examples.
-        """
-        return """
+_COMPREHENSIVE_EXAMPLES = """
 COMPREHENSIVE COMMAND EXAMPLES (Follow these patterns):
-
 FILE OPERATIONS:
 User: "list all files"
 Response: ls -la
@@ -252,6 +167,137 @@ Response: git diff
 User: "stage all changes"
 Response: git add .
 """
+
+
+# Decoding constraints for interpretation requests: a shell command is one
+# short line, so stop at the first blank line (where prose would start) and
+# cap the generated length. Fewer decoded tokens means less latency per turn.
+_INTERPRET_OPTIONS = {
+    "num_predict": 256,
+    "stop": ["\n\n"],
+}
+
+
+@dataclass
+class OllamaConfig:
+    """Configuration for Ollama client."""
+    endpoint: str = "http://localhost:11434"
+    model: str = "llama3.2"
+    timeout: int = 10
+
+
+class OllamaConnectionError(Exception):
+    """Raised when connection to Ollama fails."""
+    pass
+
+
+class OllamaInterpretationError(Exception):
+    """Raised when Ollama cannot interpret the command."""
+    pass
+
+
+class OllamaClient:
+    """Client for interacting with local Ollama service."""
+    
+    def __init__(self, config: Optional[OllamaConfig] = None):
+        """
+        Initialize Ollama client.
+        
+        Args:
+            config: Optional configuration. Uses defaults if not provided.
+        """
+        self.config = config or OllamaConfig()
+    
+    def check_connection(self) -> bool:
+        """
+        Verify that Ollama service is running and accessible.
+        
+        Returns:
+            True if Ollama is available, False otherwise.
+        
+        Raises:
+            OllamaConnectionError: If connection check fails with details.
+        """
+        try:
+            response = requests.get(
+                f"{self.config.endpoint}/api/tags",
+                timeout=self.config.timeout
+            )
+            response.raise_for_status()
+            return True
+        except requests.exceptions.ConnectionError as e:
+            raise OllamaConnectionError(
+                f"Cannot connect to Ollama at {self.config.endpoint}. "
+                "Is Ollama running? Try: 'ollama serve'"
+            ) from e
+        except requests.exceptions.Timeout as e:
+            raise OllamaConnectionError(
+                f"Connection to Ollama timed out after {self.config.timeout} seconds."
+            ) from e
+        except requests.exceptions.RequestException as e:
+            raise OllamaConnectionError(
+                f"Error connecting to Ollama: {str(e)}"
+            ) from e
+    
+    def _categorize_domain(self, user_input: str) -> list[str]:
+        """
+        Categorize user input into command domains.
+        
+        Args:
+            user_input: Natural language input from user.
+        
+        Returns:
+            List of detected domain categories (file, process, network, text).
+        """
+        input_lower = user_input.lower()
+        domains = []
+        
+        # File operation keywords
+        file_keywords = [
+            'find', 'search', 'locate', 'list', 'ls', 'copy', 'cp', 'move', 'mv',
+            'rename', 'delete', 'remove', 'file', 'files', 'directory', 'folder',
+            'path', 'tree', 'disk', 'space', 'size', 'du', 'df'
+        ]
+        if any(keyword in input_lower for keyword in file_keywords):
+            domains.append('file')
+        
+        # Process management keywords
+        process_keywords = [
+            'process', 'kill', 'stop', 'terminate', 'ps', 'top', 'running',
+            'background', 'foreground', 'job', 'jobs', 'bg', 'fg', 'cpu', 'memory',
+            'ram', 'performance', 'monitor'
+        ]
+        if any(keyword in input_lower for keyword in process_keywords):
+            domains.append('process')
+        
+        # Network operation keywords
+        network_keywords = [
+            'download', 'upload', 'curl', 'wget', 'fetch', 'http', 'https',
+            'ping', 'network', 'connection', 'port', 'netstat', 'ip', 'dns',
+            'url', 'api', 'request'
+        ]
+        if any(keyword in input_lower for keyword in network_keywords):
+            domains.append('network')
+        
+        # Text processing keywords
+        text_keywords = [
+            'grep', 'search', 'filter', 'sed', 'awk', 'replace', 'substitute',
+            'cut', 'sort', 'uniq', 'unique', 'count', 'wc', 'lines', 'words',
+            'pattern', 'match', 'pipe', 'extract'
+        ]
+        if any(keyword in input_lower for keyword in text_keywords):
+            domains.append('text')
+        
+        return domains
+    
+    def _get_comprehensive_examples(self) -> str:
+        """
+        Get comprehensive examples covering the 50 most common commands.
+        
+        Returns:
+            String containing comprehensive command examples.
+        """
+        return _COMPREHENSIVE_EXAMPLES
     
     def _get_domain_examples(self, user_input: str) -> str:
         """
@@ -427,64 +473,40 @@ Response: grep -c "pattern" file.txt
         Returns:
             Formatted prompt for Ollama.
         """
-        system_prompt = """You are a shell command interpreter. Convert natural language descriptions into shell commands.
+        # Static content first, per-turn content last: keeping the prompt
+        # prefix identical across turns lets the Ollama server reuse its
+        # cached prompt evaluation instead of reprocessing every token.
+        system_prompt = _SYSTEM_PROMPT
 
-Rules:
-- Return ONLY the shell command, nothing else
-- No explanations, no markdown, no code blocks
-- Use standard bash/zsh syntax for macOS
-- Be precise and safe
-- If the request is unclear, return the closest safe interpretation
-- Use the file list in the Context to correct file name casing (e.g., if User asks for 'readme.md' but Context shows 'README.md', use 'README.md')
-- For find/grep commands that may hit permission errors, add '2>/dev/null' to suppress error messages
-- When searching home directory or system paths, always suppress stderr with '2>/dev/null'
-- Prefer safe, non-destructive operations when ambiguous
-- Use proper quoting for filenames with spaces or special characters
-- On macOS, use 'open' command to launch applications: 'open -a "App Name"'
-- On macOS, use 'open' command to open files with default application: 'open filename'
-- On macOS, use 'open .' to open current directory in Finder
-- For complex operations, use pipes and command chaining appropriately
+        # Add comprehensive examples (always included for consistency)
+        system_prompt += self._get_comprehensive_examples()
+
+        # Add blacklist (NEVER use these patterns) - rarely changes mid-session
+        if blacklist:
+            system_prompt += "\n\nBLACKLIST (NEVER include these patterns in ANY command):"
+            for pattern in blacklist:
+                system_prompt += f"\n- NEVER use: {pattern}"
 
-IMPORTANT - Time-based file searches:
-- Use -mtime with a SINGLE number, not a range
-- -mtime -7 means "modified in the last 7 days" (less than 7 days ago)
-- -mtime +7 means "modified more than 7 days ago"
-- -mtime 7 means "modified exactly 7 days ago"
-- NEVER use syntax like -mtime 7-14 (this is INVALID)
-- When combining -name and -mtime, use AND (implicit), NEVER use -o (OR)
-- CORRECT: find . -name "*.py" -mtime -7 (python files modified in last 7 days)
-- WRONG: find with -o between -name and -mtime (this finds ALL python files OR all recent files)
-"""
-        
         # Add learned patterns from history
         if history:
             system_prompt += "\nLearned Patterns (Follow these examples):"
             for nl, cmd in history[:3]:  # Limit to 3 to save tokens
                 system_prompt += f"\nUser: \"{nl}\"\nResponse: {cmd}"
-        
+
+        # Add domain-specific examples for additional context
+        domain_examples = self._get_domain_examples(user_input)
+        if domain_examples.strip():
+            system_prompt += "\n" + domain_examples
+
         # Add negative constraints
         if rejections:
             system_prompt += "\n\nREJECTED COMMANDS (User rejected these - generate a COMPLETELY DIFFERENT command):"
             for cmd in rejections[:3]:
                 system_prompt += f"\n- REJECTED: {cmd}"
             system_prompt += "\nIMPORTANT: Do NOT generate the same or similar command. Try a different approach!"
-        
-        # Add blacklist (NEVER use these patterns)
-        if blacklist:
-            system_prompt += "\n\nBLACKLIST (NEVER include these patterns in ANY command):"
-            for pattern in blacklist:
-                system_prompt += f"\n- NEVER use: {pattern}"
-        
-        # Add comprehensive examples (always included for consistency)
-        system_prompt += self._get_comprehensive_examples()
-        
-        # Add domain-specific examples for additional context
-        domain_examples = self._get_domain_examples(user_input)
-        if domain_examples.strip():
-            system_prompt += "\n" + domain_examples
-        
+
         system_prompt += "\n\nNow interpret this command:"
-        
+
         context_str = f"\nContext: {context}" if context else ""
         return f"{system_prompt}{context_str}\nUser: {user_input}\nResponse:"
     
@@ -494,50 +516,58 @@ IMPORTANT - Time-based file searches:
         context: str = "",
         history: list[tuple[str, str]] = None,
         rejections: list[str] = None,
-        blacklist: list[str] = None
+        blacklist: list[str] = None,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Send natural language to Ollama and get shell command interpretation.
-        
+
         Args:
             natural_language: User's natural language command.
             context: Optional project/environment context.
             history: Learned patterns.
             rejections: Avoided interpretations.
             blacklist: Patterns that must NEVER appear.
-        
+            on_token: Optional callback invoked with the partial text as
+                tokens arrive; when given, the request is streamed so the
+                first tokens reach the caller before generation finishes.
+
         Returns:
             Interpreted shell command.
-        
+
         Raises:
             OllamaConnectionError: If connection fails.
             OllamaInterpretationError: If interpretation fails or returns invalid result.
         """
         if not natural_language or not natural_language.strip():
             raise OllamaInterpretationError("Cannot interpret empty input")
-        
+
         prompt = self.build_prompt(natural_language, context, history, rejections, blacklist)
-        
+
         try:
-            response = requests.post(
-                f"{self.config.endpoint}/api/generate",
-                json={
-                    "model": self.config.model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=self.config.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if "response" not in result:
-                raise OllamaInterpretationError(
-                    "Invalid response format from Ollama"
+            if on_token is not None:
+                command = self._generate_streaming(prompt, on_token)
+            else:
+                response = requests.post(
+                    f"{self.config.endpoint}/api/generate",
+                    json={
+                        "model": self.config.model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": _INTERPRET_OPTIONS
+                    },
+                    timeout=self.config.timeout
                 )
-            
-            command = result["response"].strip()
+                response.raise_for_status()
+
+                result = response.json()
+
+                if "response" not in result:
+                    raise OllamaInterpretationError(
+                        "Invalid response format from Ollama"
+                    )
+
+                command = result["response"].strip()
             
             if not command:
                 raise OllamaInterpretationError(
@@ -568,6 +598,44 @@ IMPORTANT - Time-based file searches:
                 f"Failed to parse Ollama response: {str(e)}"
             ) from e
     
+    def _generate_streaming(self, prompt: str, on_token: Callable[[str], None]) -> str:
+        """
+        Run a streamed /api/generate request, feeding partial text to a callback.
+
+        Args:
+            prompt: Fully assembled prompt.
+            on_token: Called with the accumulated text after each chunk.
+
+        Returns:
+            The complete generated text, stripped.
+        """
+        response = requests.post(
+            f"{self.config.endpoint}/api/generate",
+            json={
+                "model": self.config.model,
+                "prompt": prompt,
+                "stream": True,
+                "options": _INTERPRET_OPTIONS
+            },
+            timeout=self.config.timeout,
+            stream=True
+        )
+        response.raise_for_status()
+
+        parts = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            part = chunk.get("response", "")
+            if part:
+                parts.append(part)
+                on_token("".join(parts))
+            if chunk.get("done"):
+                break
+
+        return "".join(parts).strip()
+
     def _clean_command(self, command: str) -> str:
         """
         Clean up command string from common formatting issues.
@@ -3,13 +3,16 @@ Ritual Manager for handling multi-step command workflows.
 Orchestrates complex multi-command workflows with visual feedback.
 """
 
-import sqlite3
 import time
 from dataclasses import dataclass
 from typing import List, Optional, Callable
 from datetime import datetime
 from enum import Enum
 
+# sqlite3 comes from src.history so every module binds the same driver
+# (stdlib or pysqlite3) and exception types/connections stay compatible
+from src.history import _tune_connection, sqlite3
+
 class StepStatus(Enum):
     """Status of a ritual step."""
     PENDING = "pending"
@@ -50,6 +53,12 @@ class RitualManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the standard performance pragmas applied."""
+        conn = sqlite3.connect(self.db_path)
+        _tune_connection(conn)
+        return conn
+
     def create_ritual(self, name: str, description: str, steps: List[str]) -> None:
         """Create a new ritual with a sequence of commands."""
         if not name or not steps:
@@ -58,7 +67,7 @@ class RitualManager:
         timestamp = datetime.now().isoformat()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Insert ritual
@@ -82,7 +91,7 @@ class RitualManager:
     def get_ritual(self, name: str) -> Optional[Ritual]:
         """Retrieve a ritual and its steps by name."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Get ritual info
@@ -107,7 +116,7 @@ class RitualManager:
     def list_rituals(self) -> List[Ritual]:
         """List all available rituals (without steps for brevity)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name, description FROM rituals ORDER BY name")
                 return [
@@ -120,7 +129,7 @@ class RitualManager:
     def delete_ritual(self, name: str) -> bool:
         """Delete a ritual by name."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM rituals WHERE name = ?", (name,))
                 return cursor.rowcount > 0
         except sqlite3.Error:
@@ -13,6 +13,10 @@ class SpiritSuggestions:
     
     def __init__(self, history: HistoryManager):
         self.history = history
+        # Lowered natural-language forms cached across turns; the same
+        # history entries are rescanned every suggestion, so the lowering
+        # work is done at most once per distinct entry
+        self._lower_cache: dict = {}
     
     def get_suggestion(
         self, 
@@ -56,10 +60,16 @@ class SpiritSuggestions:
             # Search for commands that start with or contain the partial input
             recent = self.history.get_recent_commands(limit=50)
             
+            if len(self._lower_cache) > 1024:
+                self._lower_cache.clear()
+
             matches = []
             for entry in recent:
-                nl_lower = entry.natural_language.lower()
-                
+                nl_lower = self._lower_cache.get(entry.natural_language)
+                if nl_lower is None:
+                    nl_lower = entry.natural_language.lower()
+                    self._lower_cache[entry.natural_language] = nl_lower
+
                 # Exact prefix match (highest priority)
                 if nl_lower.startswith(partial):
                     matches.append((
@@ -396,6 +396,7 @@ class LoadingAnimation:
         
         # Start with the passed message, but we'll rotate immediately
         self.current_message = message
+        self.streaming = False
         
         # Use the 'moon' spinner for spooky vibes
         spinner_text = Text()
@@ -406,18 +407,27 @@ class LoadingAnimation:
     def _rotate_phrases(self):
         """Thread function to rotate through spooky phrases."""
         while not self.stop_event.is_set():
-            # Pick a random phrase
-            phrase = random.choice(SPOOKY_PHRASES)
-            
-            # Create styled text
-            text = Text()
-            text.append(phrase, style=STATUS_DIM)
-            
-            # Update spinner text
-            self.spinner.update(text=text)
-            
+            # Once partial output is streaming in, leave it on screen
+            if not self.streaming:
+                # Pick a random phrase
+                phrase = random.choice(SPOOKY_PHRASES)
+
+                # Create styled text
+                text = Text()
+                text.append(phrase, style=STATUS_DIM)
+
+                # Update spinner text
+                self.spinner.update(text=text)
+
             # Wait before next rotation
             self.stop_event.wait(1.5)
+
+    def show_partial(self, text: str):
+        """Show partial model output in place of the rotating phrases."""
+        self.streaming = True
+        styled = Text()
+        styled.append(text, style=STATUS_DIM)
+        self.spinner.update(text=styled)
     
     def __enter__(self):
         """Start the animation."""
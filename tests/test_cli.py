@@ -22,7 +22,7 @@ class TestHauntedCLI:
         assert cli.ollama is not None
         assert cli.executor is not None
         assert cli.history is not None
-        assert cli.session_history == []
+        assert len(cli.session_history) == 0
         assert cli.running is False
     
     def test_initialization_with_custom_components(self):
@@ -35,6 +35,37 @@ def test_no_correction_if_exists(corrector, tmp_path):
     
     assert corrected == "ls file.txt"
 
+def test_correct_token_that_prefixes_another_argument(corrector, tmp_path):
+    (tmp_path / "foo.txt").touch()
+    (tmp_path / "food").touch()
+
+    # `foo` is a prefix of the valid `foo.txt` argument; only the broken
+    # token should be rewritten
+    cmd = "cat foo.txt foo"
+    corrected = corrector.correct_paths(cmd, str(tmp_path))
+
+    assert corrected == "cat foo.txt food"
+
+def test_argument_matching_command_name(corrector, tmp_path):
+    (tmp_path / "food").touch()
+
+    # The broken argument spells the command name; the splice must leave
+    # the command itself alone
+    cmd = "foo foo"
+    corrected = corrector.correct_paths(cmd, str(tmp_path))
+
+    assert corrected == "foo food"
+
+def test_correct_quoted_token_with_space(corrector, tmp_path):
+    (tmp_path / "my file.txt").touch()
+
+    # The corrected name must land inside the existing quotes, not bring
+    # its own pair
+    cmd = "cat 'my fil.txt'"
+    corrected = corrector.correct_paths(cmd, str(tmp_path))
+
+    assert corrected == "cat 'my file.txt'"
+
 def test_ignores_flags(corrector, tmp_path):
     (tmp_path / "file.txt").touch()
     
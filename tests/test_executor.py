@@ -6,7 +6,7 @@ import pytest
 import os
 import tempfile
 from hypothesis import given, strategies as st, settings
-from src.executor import CommandExecutor, ExecutionResult
+from src.executor import CachedCommandExecutor, CommandExecutor, ExecutionResult
 
 
 class TestCommandExecutor:
@@ -553,3 +553,24 @@ def test_property_command_syntax_validation_invalid_operators(operator, command_
         
         assert "syntax" in str(exc_info.value).lower(), \
             "ValueError should mention syntax issue"
+
+
+class TestCachedCommandExecutor:
+    """Test the TTL result cache for read-only commands."""
+
+    def test_cached_repeat_returns_same_result(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = CachedCommandExecutor(working_directory=tmpdir)
+            first = executor.execute("pwd")
+            second = executor.execute("pwd")
+            assert first.exit_code == 0
+            # Repeat within the TTL is served from cache
+            assert second is first
+
+    def test_non_allowlisted_commands_not_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = CachedCommandExecutor(working_directory=tmpdir)
+            first = executor.execute("echo hello")
+            second = executor.execute("echo hello")
+            assert first.stdout == second.stdout
+            assert second is not first
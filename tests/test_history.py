@@ -533,3 +533,17 @@ def test_property_history_suggestions(query_term, matching_commands, non_matchin
         # Cleanup
         if os.path.exists(db_path):
             os.unlink(db_path)
+
+
+def test_batch_writes_commit_together(temp_db):
+    """Rows queued in a batch are all visible after the context exits."""
+    manager = HistoryManager(temp_db)
+
+    with manager.batch() as b:
+        b.save_command("list files", "ls", 0, 0.1)
+        b.save_command("show processes", "ps aux", 0, 0.2)
+        b.add_rejection("list files", "rm -rf /")
+
+    recent = manager.get_recent_commands(limit=5)
+    assert {e.shell_command for e in recent} >= {"ls", "ps aux"}
+    assert "rm -rf /" in manager.get_rejections("list files")